@@ -1,10 +1,15 @@
-import base64
-import json
+import binascii
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 import aiohttp
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional incremental JSON decoder
+    ijson = None
+
 from config.config import (
     SOLANA_RPC_URLS,
     HTTP_TIMEOUT_SEC,
@@ -12,23 +17,38 @@ from config.config import (
     RETRY_BACKOFF_SEC,
     RPC_MAX_RPS,
 )
-from bot.utils import with_retries
+from bot.utils import json_dumps, json_loads, with_retries
 from config.config import HTTP_MAX_CONCURRENCY, RPC_MAX_CONCURRENCY
+from config.config import HTTP_MAX_CONNS, HTTP_MAX_PER_HOST, HTTP_KEEPALIVE_SEC, HTTP_DNS_CACHE_SEC
 from bot.metrics import http_requests_total, http_request_duration_seconds, inflight_http, rpc_calls_total, inflight_rpc
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Static request headers, built once; aiohttp copies them into each request
+_POST_JSON_HEADERS = {"Content-Type": "application/json"}
+_DEX_HEADERS = {"accept": "application/json", "user-agent": "Mozilla/5.0"}
+
 
 class HttpClient:
     def __init__(self) -> None:
         self.session: Optional[aiohttp.ClientSession] = None
         self._http_sem = asyncio.Semaphore(HTTP_MAX_CONCURRENCY)
+        # url -> in-flight GET shared by concurrent callers (single-flight)
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
 
     async def start(self) -> None:
         if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SEC)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            # Bounded pool with per-host caps so repeated Dex/RPC calls reuse keep-alive connections
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNS,
+                limit_per_host=HTTP_MAX_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_SEC,
+                keepalive_timeout=HTTP_KEEPALIVE_SEC,
+                enable_cleanup_closed=True,
+            )
+            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
 
     async def close(self) -> None:
         if self.session and not self.session.closed:
@@ -36,6 +56,22 @@ class HttpClient:
 
     async def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         assert self.session is not None
+        # Coalesce concurrent GETs of the same URL (e.g. a CA mentioned in many
+        # channels at once) onto a single upstream request
+        fut = self._inflight.get(url)
+        if fut is None:
+            fut = asyncio.ensure_future(self._get_json(url, headers))
+            self._inflight[url] = fut
+
+            def _done(f: "asyncio.Future[Dict[str, Any]]") -> None:
+                if self._inflight.get(url) is f:
+                    del self._inflight[url]
+
+            fut.add_done_callback(_done)
+        return await asyncio.shield(fut)
+
+    async def _get_json(self, url: str, headers: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        assert self.session is not None
 
         async def _do() -> Dict[str, Any]:
             async with self._http_sem:
@@ -44,157 +80,295 @@ class HttpClient:
                     import time as _time
                     _t0 = _time.perf_counter()
                     async with self.session.get(url, headers=headers) as resp:
-                        text = await resp.text()
+                        body = await resp.read()
                         http_request_duration_seconds.labels("dexscreener").observe(_time.perf_counter() - _t0)
                         http_requests_total.labels("dexscreener", str(resp.status)).inc()
                         if resp.status != 200:
-                            raise RuntimeError(f"GET {url} -> {resp.status} {text[:200]}")
+                            raise RuntimeError(f"GET {url} -> {resp.status} {body[:200]!r}")
                         try:
-                            return json.loads(text)
-                        except Exception:
-                            return {"raw": text}
+                            return json_loads(body)
+                        except ValueError:
+                            return {"raw": body.decode("utf-8", errors="replace")}
                 finally:
                     inflight_http.dec()
 
         return await with_retries(_do, HTTP_RETRIES, RETRY_BACKOFF_SEC)
 
-    async def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    async def get_json_stream(
+        self,
+        url: str,
+        prefix: str,
+        headers: Optional[Dict[str, str]] = None,
+        payload: Any = None,
+        target: str = "rpc",
+    ) -> AsyncIterator[Any]:
+        """Yield the JSON values found at ``prefix`` (ijson path syntax, e.g. ``"result.item"``).
+
+        With a ``payload`` the request is a JSON POST (as for JSON-RPC, e.g. ``getProgramAccounts``),
+        otherwise a GET; ``target`` labels the HTTP metrics. With ijson installed, items are decoded
+        incrementally as chunks arrive so large responses never sit in memory whole; otherwise the
+        body is decoded once and walked. Streaming responses cannot be replayed, so this path does
+        not retry.
+
+        The concurrency slot is released once response headers arrive, but the connection stays
+        checked out until the body is consumed: callers that may stop early should wrap the
+        generator in ``contextlib.aclosing`` (or ``await gen.aclose()``) to release it promptly.
+        """
         assert self.session is not None
-        _headers = {"Content-Type": "application/json"}
-        if headers:
-            _headers.update(headers)
+        if payload is not None:
+            _headers = {**_POST_JSON_HEADERS, **headers} if headers else _POST_JSON_HEADERS
+            body_bytes = payload if isinstance(payload, bytes) else json_dumps(payload)
+        data: Any = None
+        t0: Optional[float] = None
+        try:
+            async with self._http_sem:
+                inflight_http.inc()
+                t0 = time.perf_counter()
+                if payload is not None:
+                    resp = await self.session.post(url, data=body_bytes, headers=_headers)
+                else:
+                    resp = await self.session.get(url, headers=headers)
+            async with resp:
+                http_requests_total.labels(target, str(resp.status)).inc()
+                if resp.status != 200:
+                    body = await resp.read()
+                    raise RuntimeError(f"{'POST' if payload is not None else 'GET'} {url} -> {resp.status} {body[:200]!r}")
+                if ijson is not None:
+                    async for item in ijson.items(resp.content, prefix, use_float=True):
+                        yield item
+                    return
+                data = json_loads(await resp.read())
+        finally:
+            if t0 is not None:
+                http_request_duration_seconds.labels(target).observe(time.perf_counter() - t0)
+                inflight_http.dec()
+        for item in _iter_json_prefix(data, prefix.split(".") if prefix else []):
+            yield item
 
-        async def _do() -> Dict[str, Any]:
+    async def post_json(self, url: str, payload: Any, headers: Optional[Dict[str, str]] = None) -> Any:
+        """POST ``payload`` as JSON; ``bytes`` payloads are taken as already-encoded JSON and sent as-is."""
+        assert self.session is not None
+        _headers = {**_POST_JSON_HEADERS, **headers} if headers else _POST_JSON_HEADERS
+        body_bytes = payload if isinstance(payload, bytes) else json_dumps(payload)
+
+        async def _do() -> Any:
             async with self._http_sem:
                 inflight_http.inc()
                 try:
                     import time as _time
                     _t0 = _time.perf_counter()
-                    async with self.session.post(url, json=payload, headers=_headers) as resp:
-                        text = await resp.text()
+                    async with self.session.post(url, data=body_bytes, headers=_headers) as resp:
+                        body = await resp.read()
                         target = "phanes" if "phanes" in url else "rpc"
                         http_request_duration_seconds.labels(target).observe(_time.perf_counter() - _t0)
                         http_requests_total.labels(target, str(resp.status)).inc()
                         if resp.status != 200:
-                            raise RuntimeError(f"POST {url} -> {resp.status} {text[:200]}")
+                            raise RuntimeError(f"POST {url} -> {resp.status} {body[:200]!r}")
                         try:
-                            return json.loads(text)
-                        except Exception:
-                            return {"raw": text}
+                            return json_loads(body)
+                        except ValueError:
+                            return {"raw": body.decode("utf-8", errors="replace")}
                 finally:
                     inflight_http.dec()
 
         return await with_retries(_do, HTTP_RETRIES, RETRY_BACKOFF_SEC)
 
 
+def _iter_json_prefix(node: Any, parts: List[str]) -> Iterator[Any]:
+    # Mirrors ijson prefixes: dotted object keys, with "item" stepping into array elements
+    if not parts:
+        yield node
+        return
+    head, rest = parts[0], parts[1:]
+    if head == "item" and isinstance(node, list):
+        for child in node:
+            yield from _iter_json_prefix(child, rest)
+    elif isinstance(node, dict) and head in node:
+        yield from _iter_json_prefix(node[head], rest)
+
+
 http_client = HttpClient()
 
 
 # ================== DexScreener ==================
-async def get_dex_metrics(ca: str) -> Dict[str, Any]:
-    url = f"https://api.dexscreener.com/latest/dex/tokens/{ca}"
-    try:
-        data = await http_client.get_json(url, headers={"accept": "application/json", "user-agent": "Mozilla/5.0"})
-    except Exception as e:
-        logger.warning(f"Dexscreener fetch failed for {ca}: {e}")
-        return {}
-    pairs = (data.get('pairs') or [])
-    pair = None
-    for p in pairs:
-        if p.get('chainId') == 'solana':
-            pair = p
-            break
-    # Enforce Solana-only: if no Solana pair, treat as not found
-    if not pair:
-        return {}
-    liq = ((pair.get('liquidity') or {}).get('usd')) or 0
-    vol = ((pair.get('volume') or {}).get('h24')) or 0
-    vol1h = ((pair.get('volume') or {}).get('h1')) or 0
-    symbol = ((pair.get('baseToken') or {}).get('symbol')) or None
-    price = pair.get('priceUsd')
-    market_cap = pair.get('marketCap') or pair.get('fdv') or 0
-    txns = pair.get('txns') or {}
+def _parse_dex_pair(pair: Dict[str, Any]) -> Dict[str, Any]:
+    # Each nested object is looked up once and bound locally; missing or
+    # non-object fields fall back to empty dicts / zero.
+    get = pair.get
+    liquidity = get('liquidity') or {}
+    volume = get('volume') or {}
+    txns = get('txns')
     tx_h1 = (txns.get('h1') or {}) if isinstance(txns, dict) else {}
+    price_change = get('priceChange')
+    if not isinstance(price_change, dict):
+        price_change = {}
     buys_h1 = float(tx_h1.get('buys') or 0)
     sells_h1 = float(tx_h1.get('sells') or 0)
-    total_h1 = buys_h1 + sells_h1
-    bs_ratio_h1 = (buys_h1 / sells_h1) if sells_h1 > 0 else (buys_h1 if buys_h1 > 0 else 0)
-    price_change = pair.get('priceChange') or {}
-    pc_m5 = float((price_change.get('m5') or 0) if isinstance(price_change, dict) else 0)
-    pc_m15 = float((price_change.get('m15') or 0) if isinstance(price_change, dict) else 0)
-    pc_h1 = float((price_change.get('h1') or 0) if isinstance(price_change, dict) else 0)
-    created_ms = pair.get('pairCreatedAt') or pair.get('createdAt')
-    trending_score = pair.get('trendingScore') or 0
-    is_hot = bool(pair.get('isHot')) or (float(trending_score or 0) > 0)
+    bs_ratio_h1 = (buys_h1 / sells_h1) if sells_h1 > 0 else buys_h1
+    price = get('priceUsd')
+    created_ms = get('pairCreatedAt') or get('createdAt')
     return {
-        'liquidity_usd': float(liq or 0),
-        'volume24_usd': float(vol or 0),
-        'volume1h_usd': float(vol1h or 0),
-        'symbol': symbol,
-        'price_usd': float(price or 0) if price else None,
-        'market_cap_usd': float(market_cap or 0),
+        'liquidity_usd': float(liquidity.get('usd') or 0),
+        'volume24_usd': float(volume.get('h24') or 0),
+        'volume1h_usd': float(volume.get('h1') or 0),
+        'symbol': (get('baseToken') or {}).get('symbol') or None,
+        'price_usd': float(price) if price else None,
+        'market_cap_usd': float(get('marketCap') or get('fdv') or 0),
         'txns_h1_buys': int(buys_h1),
         'txns_h1_sells': int(sells_h1),
-        'txns_h1_total': int(total_h1),
+        'txns_h1_total': int(buys_h1 + sells_h1),
         'buy_sell_ratio_h1': float(bs_ratio_h1),
-        'price_change_m5': pc_m5,
-        'price_change_m15': pc_m15,
-        'price_change_h1': pc_h1,
-        'pair_created_ms': int(created_ms or 0) if created_ms else None,
-        'trending': is_hot,
+        'price_change_m5': float(price_change.get('m5') or 0),
+        'price_change_m15': float(price_change.get('m15') or 0),
+        'price_change_h1': float(price_change.get('h1') or 0),
+        'pair_created_ms': int(created_ms) if created_ms else None,
+        'trending': bool(get('isHot')) or float(get('trendingScore') or 0) > 0,
     }
 
 
+async def get_dex_metrics(ca: str) -> Dict[str, Any]:
+    url = f"https://api.dexscreener.com/latest/dex/tokens/{ca}"
+    try:
+        data = await http_client.get_json(url, headers=_DEX_HEADERS)
+    except Exception as e:
+        logger.warning("Dexscreener fetch failed for %s: %s", ca, e)
+        return {}
+    # Enforce Solana-only: if no Solana pair, treat as not found
+    for pair in (data.get('pairs') or []):
+        if pair.get('chainId') == 'solana':
+            return _parse_dex_pair(pair)
+    return {}
+
+
 # ================== Birdeye ==================
 # Birdeye API removed - not working
 
 
 # ================== Solana RPC ==================
 _rpc_index = 0
-_last_rpc_ts = 0.0
+# Per-endpoint in-flight caps and pacing slots so N endpoints run in parallel,
+# each respecting its own RPC_MAX_RPS instead of one global serialised throttle.
+_rpc_sems: Dict[str, asyncio.Semaphore] = {}
+_rpc_next_slot: Dict[str, float] = {}
+# Endpoint load tracking for weighted selection: requests queued/in flight and
+# an exponential moving average of observed latency (failures count as a timeout).
+_rpc_pending: Dict[str, int] = {}
+_rpc_ema_ms: Dict[str, float] = {}
+_RPC_EMA_ALPHA = 0.2
+_RPC_DEFAULT_MS = 100.0
 
 
-async def solana_rpc(method: str, params: list) -> Any:
-    global _rpc_index, _last_rpc_ts
+def _rpc_sem(url: str) -> asyncio.Semaphore:
+    sem = _rpc_sems.get(url)
+    if sem is None:
+        sem = asyncio.Semaphore(max(1, RPC_MAX_CONCURRENCY))
+        _rpc_sems[url] = sem
+    return sem
+
+
+async def _rpc_pace(url: str) -> None:
+    if not RPC_MAX_RPS or RPC_MAX_RPS <= 0:
+        return
+    # Reserve the next send slot for this endpoint, then sleep until it arrives
+    now = asyncio.get_running_loop().time()
+    slot = max(now, _rpc_next_slot.get(url, 0.0))
+    _rpc_next_slot[url] = slot + 1.0 / RPC_MAX_RPS
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+
+def _next_rpc_url() -> str:
+    global _rpc_index
     if not SOLANA_RPC_URLS:
         raise RuntimeError("No Solana RPC URLs configured")
-    url = SOLANA_RPC_URLS[_rpc_index % len(SOLANA_RPC_URLS)]
+    n = len(SOLANA_RPC_URLS)
+    start = _rpc_index % n
     _rpc_index += 1
-    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
-    # Simple token-bucket style throttle to respect RPC_MAX_RPS
-    if RPC_MAX_RPS and RPC_MAX_RPS > 0:
-        import time, asyncio as _asyncio
-        min_interval = 1.0 / RPC_MAX_RPS
-        now = time.perf_counter()
-        sleep_for = _last_rpc_ts + min_interval - now
-        if sleep_for > 0:
-            await _asyncio.sleep(sleep_for)
-        _last_rpc_ts = time.perf_counter()
+    if n == 1:
+        return SOLANA_RPC_URLS[0]
+    # Pick the endpoint with the lowest expected wait; the rotating start breaks ties
+    # so idle endpoints with equal latency still share load round-robin.
+    best_url = SOLANA_RPC_URLS[start]
+    best_cost = float("inf")
+    for i in range(n):
+        url = SOLANA_RPC_URLS[(start + i) % n]
+        cost = (_rpc_pending.get(url, 0) + 1) * _rpc_ema_ms.get(url, _RPC_DEFAULT_MS)
+        if cost < best_cost:
+            best_url, best_cost = url, cost
+    return best_url
+
+
+def _record_rpc_latency(url: str, sample_ms: float) -> None:
+    prev = _rpc_ema_ms.get(url)
+    _rpc_ema_ms[url] = sample_ms if prev is None else prev + _RPC_EMA_ALPHA * (sample_ms - prev)
+
+
+async def _rpc_post(label: str, payload: Any) -> Any:
+    url = _next_rpc_url()
+    _rpc_pending[url] = _rpc_pending.get(url, 0) + 1
     try:
-        inflight_rpc.inc()
-        data = await http_client.post_json(url, payload)
-        rpc_calls_total.labels(method, "ok").inc()
-    except Exception as e:
-        rpc_calls_total.labels(method, "error").inc()
-        raise RuntimeError(f"RPC {method} failed: {e}")
+        async with _rpc_sem(url):
+            await _rpc_pace(url)
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            try:
+                inflight_rpc.inc()
+                data = await http_client.post_json(url, payload)
+                _record_rpc_latency(url, (loop.time() - t0) * 1000.0)
+                rpc_calls_total.labels(label, "ok").inc()
+            except Exception as e:
+                _record_rpc_latency(url, HTTP_TIMEOUT_SEC * 1000.0)
+                rpc_calls_total.labels(label, "error").inc()
+                raise RuntimeError(f"RPC {label} failed: {e}")
+            finally:
+                inflight_rpc.dec()
     finally:
-        inflight_rpc.dec()
+        _rpc_pending[url] -= 1
+    return data
+
+
+async def solana_rpc(method: str, params: list) -> Any:
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    data = await _rpc_post(method, payload)
     if 'error' in data:
         raise RuntimeError(str(data['error']))
     return data.get('result')
 
 
+async def solana_rpc_batch(calls: List[Tuple[str, list]]) -> List[Any]:
+    """Send several JSON-RPC calls in a single POST and return their results in call order.
+
+    Raises RuntimeError if the batch fails or any individual call returns an error.
+    """
+    payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, (method, params) in enumerate(calls)]
+    data = await _rpc_post("+".join(method for method, _ in calls), payload)
+    if not isinstance(data, list):
+        raise RuntimeError(f"RPC batch failed: {data.get('error') if isinstance(data, dict) else data}")
+    by_id = {item.get('id'): item for item in data if isinstance(item, dict)}
+    results: List[Any] = []
+    for i, (method, _) in enumerate(calls):
+        item = by_id.get(i)
+        if item is None:
+            raise RuntimeError(f"RPC {method} missing from batch response")
+        if 'error' in item:
+            raise RuntimeError(str(item['error']))
+        results.append(item.get('result'))
+    return results
+
+
 async def solana_get_account_info(mint: str) -> Optional[bytes]:
     try:
         result = await solana_rpc("getAccountInfo", [mint, {"encoding": "base64"}])
     except Exception as e:
-        logger.warning(f"getAccountInfo failed for {mint}: {e}")
+        logger.warning("getAccountInfo failed for %s: %s", mint, e)
         return None
     if not result or not result.get('value'):
         return None
     data_b64 = result['value']['data'][0]
     try:
-        return base64.b64decode(data_b64)
+        # RPC output is trusted ASCII: a2b_base64 takes the str as-is, skipping b64decode's
+        # argument normalization and the altchars/validate handling we never use
+        return binascii.a2b_base64(data_b64)
     except Exception:
         return None
 
@@ -1,7 +1,14 @@
+import asyncio
+import heapq
 import logging
-from datetime import datetime, timedelta, timezone
-from math import exp
-from typing import Any, Dict, List, Optional, Set, Tuple
+import struct
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+from math import exp, log
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
 
 from config.config import (
     OVERLAP_WINDOW_MIN,
@@ -36,57 +43,176 @@ from config.config import (
     T3_POS_TREND_REQUIRED,
     T3_AGE_MIN_MINUTES,
     T3_AGE_MAX_MINUTES,
+    EVAL_CACHE_MAX_ENTRIES,
+    DEX_CACHE_TTL_SEC,
+    SAFETY_CACHE_TTL_SEC,
+    SAFETY_NEGATIVE_TTL_SEC,
+    HOLDERS_CACHE_TTL_SEC,
 )
-from bot.apis import get_dex_metrics, solana_get_account_info, solana_rpc
+from bot.apis import get_dex_metrics, solana_get_account_info, solana_rpc_batch
 from bot.stats import StatsRecorder, SignalEvent
+from bot.utils import ScanResistantTTLCache, TTLCache
 
 logger = logging.getLogger(__name__)
 
 
 class Mention:
-    __slots__ = ("timestamp_utc", "channel", "tier", "weight")
+    __slots__ = ("timestamp_utc", "channel", "tier", "weight", "channel_id")
 
-    def __init__(self, timestamp_utc: datetime, channel: str, tier: int, weight: float) -> None:
+    def __init__(self, timestamp_utc: float, channel: str, tier: int, weight: float, channel_id: int) -> None:
+        # timestamp_utc is epoch seconds (time.time()); float math keeps the per-mention loop cheap
         self.timestamp_utc = timestamp_utc
         self.channel = channel
         self.tier = tier
         self.weight = weight
+        # Small int from EvaluatorState.channel_ids; one bit per channel in the unique-count bitmap
+        self.channel_id = channel_id
 
 
-def _now_utc() -> datetime:
-    return datetime.now(timezone.utc)
+def _now_ts() -> float:
+    return time.time()
 
 
-def _decay_multiplier(age_minutes: float) -> float:
-    if age_minutes <= 0:
-        return 1.0
-    half_life = max(MENTION_DECAY_HALF_LIFE_MIN, 1.0)
-    return exp(-0.6931471805599453 * (age_minutes / half_life))
+# int.bit_count is 3.10+; bin().count is the portable popcount
+_popcount = getattr(int, "bit_count", None) or (lambda x: bin(x).count("1"))
 
 
-def _summarize_channels(mentions: List[Mention]) -> str:
-    uniq: List[str] = []
-    seen: Set[str] = set()
-    for m in mentions:
-        name = m.channel
-        if name not in seen:
-            uniq.append(name)
-            seen.add(name)
-        if len(uniq) >= 3:
+# exp(-ln2 * age_min / half_life) == exp(_DECAY_K * age_sec); the half-life is fixed for the
+# process, so the constant is folded once and call sites inline exp() on float seconds
+_DECAY_K = -log(2) / (max(MENTION_DECAY_HALF_LIFE_MIN, 1.0) * 60.0)
+
+
+# Window widths in seconds, fixed for the process
+_MENTION_RETENTION_SEC = 3 * 3600.0
+_OVERLAP_SEC = OVERLAP_WINDOW_MIN * 60.0
+_VEL5_SEC = VEL5_WINDOW_MIN * 60.0
+_VEL10_SEC = VEL10_WINDOW_MIN * 60.0
+
+
+def _window_stats(
+    mentions: Deque[Mention], now_ts: float, overlap_sec: float, vel5_sec: float, vel10_sec: float
+) -> Tuple[int, int, int]:
+    """Unique channel count inside the overlap window plus the two velocity counts, in one pass.
+
+    Mentions are chronological, so the walk goes newest-first and stops at the widest
+    window; only in-window mentions are ever touched. Unique channels are OR-ed into an
+    int bitmap by channel id, so no strings are hashed.
+    """
+    overlap_cutoff = now_ts - overlap_sec
+    vel5_cutoff = now_ts - vel5_sec
+    vel10_cutoff = now_ts - vel10_sec
+    oldest_cutoff = min(overlap_cutoff, vel5_cutoff, vel10_cutoff)
+    vel5 = 0
+    vel10 = 0
+    bits = 0
+    for m in reversed(mentions):
+        ts = m.timestamp_utc
+        if ts < oldest_cutoff:
             break
-    return ", ".join([n if len(n) <= 20 else (n[:17] + '...') for n in uniq])
+        if ts >= overlap_cutoff:
+            bits |= 1 << m.channel_id
+        if ts >= vel5_cutoff:
+            vel5 += 1
+        if ts >= vel10_cutoff:
+            vel10 += 1
+    return _popcount(bits), vel5, vel10
+
+
+def _compute_age_minutes(now_ts: float, pair_created_s: Optional[float], first_seen_s: Optional[float]) -> Optional[float]:
+    """Token age from the pair creation time, falling back to when we first saw the CA."""
+    if pair_created_s:
+        return max(0.0, (now_ts - pair_created_s) / 60.0)
+    if first_seen_s is not None:
+        return (now_ts - first_seen_s) / 60.0
+    return None
+
+
+def _iso_to_ts(value: Any) -> Optional[float]:
+    """Epoch seconds for a persisted ISO timestamp, or None if it does not parse."""
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+_ALERT_TITLES = {'T1': '🔥 Consensus T1', 'T2': '🚀 UPGRADE: T2', 'T3': '🚀🚀 UPGRADE: T3'}
+
+
+def _summarize_channels(mentions: Iterable[Mention]) -> str:
+    # dict.fromkeys dedups in first-seen order in C; per-CA mention lists are short (3h window)
+    names = islice(dict.fromkeys(m.channel for m in mentions), 3)
+    return ", ".join(n if len(n) <= 20 else (n[:17] + '...') for n in names)
+
+
+def _make_tier_gates(
+    t2_age_min: float,
+    t2_age_max: float,
+    t2_liq_min: float,
+    t2_drawdown_max: float,
+    t2_txns_min: int,
+    t2_bs_min: float,
+    t3_age_min: float,
+    t3_age_max: float,
+    t3_mcap_min: float,
+    t3_vol24_min: float,
+    t3_price_min_x: float,
+    t3_price_max_x: float,
+    t3_trend_required: bool,
+):
+    """Bind the tier thresholds into closures once, so the per-mention checks read
+    cell variables instead of resolving a dozen module globals on every call."""
+
+    def t2_in_window(age_min: Optional[float]) -> bool:
+        return age_min is not None and t2_age_min <= age_min <= t2_age_max
+
+    def t2_market_ok(liquidity_usd: float, drawdown_pct: float, txns_h1_total: int, bs_ratio: float, vip_count: int) -> bool:
+        return (
+            liquidity_usd >= t2_liq_min and
+            drawdown_pct <= t2_drawdown_max and
+            txns_h1_total >= t2_txns_min and
+            bs_ratio >= t2_bs_min and
+            vip_count >= 1
+        )
+
+    def t3_market_ok(age_min: Optional[float], market_cap_usd: float, volume24_usd: float,
+                     price_multiple: Optional[float], price_change_m15: float) -> bool:
+        if age_min is not None and not (t3_age_min <= age_min <= t3_age_max):
+            return False
+        if price_multiple is not None and not (t3_price_min_x <= price_multiple < t3_price_max_x):
+            return False
+        if t3_trend_required and not price_change_m15 > 0.0:
+            return False
+        return market_cap_usd >= t3_mcap_min and volume24_usd >= t3_vol24_min
+
+    return t2_in_window, t2_market_ok, t3_market_ok
 
 
 class EvaluatorState:
     def __init__(self) -> None:
-        self.mentions_by_ca: Dict[str, List[Mention]] = {}
+        # ca -> mentions in arrival (chronological) order; expired ones are popped from the left
+        self.mentions_by_ca: Dict[str, Deque[Mention]] = {}
         self.last_rank_sent: Dict[str, str] = {}
-        self.safety_cache: Dict[str, Tuple[bool, bool]] = {}
-        self.dex_cache: Dict[str, Dict[str, Any]] = {}
+        # ca -> (mint_revoked, freeze_revoked); authorities rarely change, so a long TTL
+        self.safety_cache = TTLCache(EVAL_CACHE_MAX_ENTRIES, SAFETY_CACHE_TTL_SEC)
+        # ca -> get_dex_metrics() result; scan-resistant so one-off CAs don't evict tokens being re-mentioned
+        self.dex_cache = ScanResistantTTLCache(EVAL_CACHE_MAX_ENTRIES, DEX_CACHE_TTL_SEC)
+        # ca -> holders_and_whales_ok() verdict; spares the RPC pair when T2 and T3 both ask
+        self.holders_cache = TTLCache(EVAL_CACHE_MAX_ENTRIES, HOLDERS_CACHE_TTL_SEC)
         self.vip_holders_by_ca: Dict[str, Set[str]] = {}
         self.t1_price_usd: Dict[str, float] = {}
-        self.first_seen_ts: Dict[str, datetime] = {}
+        # ca -> epoch seconds we first saw it; ISO strings only when persisted
+        self.first_seen_ts: Dict[str, float] = {}
         self.peak_liquidity_usd: Dict[str, float] = {}
+        # ca -> (decayed mention weight, as-of epoch seconds); kept equal to the decayed sum over mentions_by_ca[ca]
+        self.decayed_score_by_ca: Dict[str, Tuple[float, float]] = {}
+        # Min-heap of (expiry of the oldest held mention, ca), one entry per tracked CA, so
+        # prune_memory only visits CAs that actually have something to drop
+        self.mention_expiry: List[Tuple[float, str]] = []
+        # channel key -> small dense id, assigned on first mention; the channel set is small and fixed
+        self.channel_ids: Dict[str, int] = {}
+        # Set whenever a persisted field (see Evaluator.to_persisted_state) changes; the state
+        # saver skips the snapshot copy and disk write while it stays False
+        self.dirty = False
 
 
 class Evaluator:
@@ -94,12 +220,29 @@ class Evaluator:
         self.state = EvaluatorState()
         self.send_message = send_message_fn
         self.stats = StatsRecorder()
+        # ca -> in-flight holders check shared by concurrent callers
+        self._holders_inflight: Dict[str, "asyncio.Future[bool]"] = {}
+        self._t2_in_window, self._t2_market_ok, self._t3_market_ok = _make_tier_gates(
+            T2_AGE_MIN_MINUTES,
+            T2_AGE_MAX_MINUTES,
+            max(LIQ_MIN_USD, T2_LIQ_MIN_USD),
+            T2_LIQ_DRAWDOWN_MAX_PCT,
+            T2_TXNS_H1_MIN,
+            T2_BUY_SELL_RATIO_MIN,
+            T3_AGE_MIN_MINUTES,
+            T3_AGE_MAX_MINUTES,
+            T3_MCAP_MIN_USD,
+            T3_VOL24_MIN_USD,
+            T3_PRICE_MIN_X,
+            T3_PRICE_MAX_X,
+            T3_POS_TREND_REQUIRED,
+        )
 
     def to_persisted_state(self) -> Dict[str, Any]:
         return {
             "last_rank_sent": dict(self.state.last_rank_sent),
             "t1_price_usd": dict(self.state.t1_price_usd),
-            "first_seen_ts": {k: v.isoformat() for k, v in self.state.first_seen_ts.items()},
+            "first_seen_ts": {k: datetime.fromtimestamp(v, tz=timezone.utc).isoformat() for k, v in self.state.first_seen_ts.items()},
             "peak_liquidity_usd": dict(self.state.peak_liquidity_usd),
         }
 
@@ -118,11 +261,8 @@ class Evaluator:
             except Exception:
                 pass
         if isinstance(first_seen, dict):
-            for k, v in first_seen.items():
-                try:
-                    self.state.first_seen_ts[str(k)] = datetime.fromisoformat(str(v))
-                except Exception:
-                    continue
+            parsed = {str(k): _iso_to_ts(v) for k, v in first_seen.items()}
+            self.state.first_seen_ts.update({k: ts for k, ts in parsed.items() if ts is not None})
         if isinstance(peak_liq, dict):
             try:
                 self.state.peak_liquidity_usd.update({str(k): float(v) for k, v in peak_liq.items()})
@@ -130,56 +270,112 @@ class Evaluator:
                 pass
 
     def prune_memory(self) -> None:
-        now = _now_utc()
-        three_hours_ago = now - timedelta(hours=3)
-        # Prune mentions
-        new_mentions: Dict[str, List[Mention]] = {}
-        for ca, arr in self.state.mentions_by_ca.items():
-            kept = [m for m in arr if m.timestamp_utc >= three_hours_ago]
-            if kept:
-                new_mentions[ca] = kept
-        self.state.mentions_by_ca = new_mentions
-        # Prune dex cache older than 1 hour
-        pruned_dex: Dict[str, Dict[str, Any]] = {}
-        for ca, d in self.state.dex_cache.items():
-            ts = d.get("ts")
-            if ts and isinstance(ts, datetime):
-                if (now - ts).total_seconds() <= 3600:
-                    pruned_dex[ca] = d
-        self.state.dex_cache = pruned_dex
-        # Limit caches to prevent unbounded growth
+        now_ts = _now_ts()
+        three_hours_ago = now_ts - _MENTION_RETENTION_SEC
+        # Prune mentions in place (the VIP watcher holds a reference to this dict)
+        mentions_by_ca = self.state.mentions_by_ca
+        heap = self.state.mention_expiry
+        while heap and heap[0][0] <= now_ts:
+            _, ca = heapq.heappop(heap)
+            arr = mentions_by_ca.get(ca)
+            if arr is None:
+                continue
+            self._expire_mentions(ca, arr, three_hours_ago, now_ts)
+            if arr:
+                # process_mention may already have trimmed this CA; re-key on its current head
+                heapq.heappush(heap, (arr[0].timestamp_utc + _MENTION_RETENTION_SEC, ca))
+            else:
+                del mentions_by_ca[ca]
+                self.state.decayed_score_by_ca.pop(ca, None)
+        # Drop expired market/safety cache entries
+        self.state.dex_cache.expire()
+        self.state.safety_cache.expire()
+        self.state.holders_cache.expire()
+        # Limit caches to prevent unbounded growth: evict the oldest CAs that are no longer
+        # being mentioned, in place, instead of rebuilding from an arbitrary key slice
         max_keys = 2000
-        if len(self.state.last_rank_sent) > max_keys:
-            # keep most recent by presence in mentions or arbitrary trim
-            keep = set(list(self.state.mentions_by_ca.keys())[:max_keys])
-            self.state.last_rank_sent = {k: v for k, v in self.state.last_rank_sent.items() if k in keep}
-        if len(self.state.t1_price_usd) > max_keys:
-            keep = set(list(self.state.mentions_by_ca.keys())[:max_keys])
-            self.state.t1_price_usd = {k: v for k, v in self.state.t1_price_usd.items() if k in keep}
+        for d in (self.state.last_rank_sent, self.state.t1_price_usd):
+            excess = len(d) - max_keys
+            if excess > 0:
+                stale = [k for k in d if k not in mentions_by_ca][:excess]
+                for k in stale:
+                    del d[k]
+                if stale:
+                    self.state.dirty = True
+
+    def _decayed_score(self, ca: str, now_ts: float) -> float:
+        prev = self.state.decayed_score_by_ca.get(ca)
+        if prev is None:
+            return 0.0
+        elapsed = now_ts - prev[1]
+        return prev[0] * exp(_DECAY_K * elapsed) if elapsed > 0 else prev[0]
+
+    def _expire_mentions(self, ca: str, arr: Deque[Mention], cutoff_ts: float, now_ts: float) -> None:
+        """Pop mentions older than ``cutoff_ts`` and take their share out of the running decayed score."""
+        if not arr or arr[0].timestamp_utc >= cutoff_ts:
+            return
+        score = self._decayed_score(ca, now_ts)
+        while arr and arr[0].timestamp_utc < cutoff_ts:
+            m = arr.popleft()
+            score -= m.weight * exp(_DECAY_K * (now_ts - m.timestamp_utc))
+        self.state.decayed_score_by_ca[ca] = (max(0.0, score), now_ts)
 
     async def ensure_safety_checked(self, ca: str) -> Tuple[bool, bool]:
-        if ca in self.state.safety_cache:
-            return self.state.safety_cache[ca]
+        cached = self.state.safety_cache.get(ca)
+        if cached is not None:
+            return cached
         mint_revoked = False
         freeze_revoked = False
+        data = None
         try:
             data = await solana_get_account_info(ca)
             if data:
                 mint_revoked, freeze_revoked = parse_mint_safety(data)
         except Exception as e:
-            logger.warning(f"Safety check failed for {ca}: {e}")
-        self.state.safety_cache[ca] = (mint_revoked, freeze_revoked)
-        return self.state.safety_cache[ca]
+            logger.warning("Safety check failed for %s: %s", ca, e)
+        # Missing/failed lookups are negative-cached briefly so they get retried
+        ttl = SAFETY_CACHE_TTL_SEC if data else SAFETY_NEGATIVE_TTL_SEC
+        self.state.safety_cache.set(ca, (mint_revoked, freeze_revoked), ttl=ttl)
+        return mint_revoked, freeze_revoked
+
+    async def _fetch_dex(self, ca: str) -> Optional[Dict[str, Any]]:
+        dex = await get_dex_metrics(ca)
+        if dex:
+            # Float creation time stored with the cached entry so age checks stay float math
+            created_ms = dex.get('pair_created_ms')
+            dex['pair_created_s'] = float(created_ms) / 1000.0 if created_ms else None
+        self.state.dex_cache[ca] = dex
+        return dex
 
     async def holders_and_whales_ok(self, ca: str) -> bool:
-        # Conservative default on failure: False
+        cached = self.state.holders_cache.get(ca)
+        if cached is not None:
+            return cached
+        # Concurrent mentions of a cold CA share one RPC batch instead of each firing their own
+        fut = self._holders_inflight.get(ca)
+        if fut is None:
+            fut = asyncio.ensure_future(self._check_holders(ca))
+            self._holders_inflight[ca] = fut
+
+            def _done(f: "asyncio.Future[bool]") -> None:
+                if self._holders_inflight.get(ca) is f:
+                    del self._holders_inflight[ca]
+
+            fut.add_done_callback(_done)
+        return await asyncio.shield(fut)
+
+    async def _check_holders(self, ca: str) -> bool:
+        # Conservative default on failure: False (not cached, so the next mention retries)
         try:
-            # Use RPC approximation for holder data
-            supply_info = await solana_rpc("getTokenSupply", [ca])
+            # Use RPC approximation for holder data; supply and largest accounts in one batched POST
+            supply_info, largest_accounts = await solana_rpc_batch([
+                ("getTokenSupply", [ca]),
+                ("getTokenLargestAccounts", [ca, {"commitment": "confirmed"}]),
+            ])
             supply = float((((supply_info or {}).get('value') or {}).get('uiAmount')) or 0)
             if supply <= 0:
+                self.state.holders_cache[ca] = False
                 return False
-            largest_accounts = await solana_rpc("getTokenLargestAccounts", [ca, {"commitment": "confirmed"}])
             values = (largest_accounts or {}).get('value') or []
             max_amount = 0.0
             unique_holders = 0
@@ -196,124 +392,102 @@ class Evaluator:
                     await self.stats.record_holders(ca, supply, largest_pct, unique_holders)
             except Exception:
                 pass
-            return (unique_holders >= HOLDERS_THRESHOLD and largest_pct <= LARGEST_WALLET_MAX)
+            ok = unique_holders >= HOLDERS_THRESHOLD and largest_pct <= LARGEST_WALLET_MAX
+            self.state.holders_cache[ca] = ok
+            return ok
         except Exception as e:
-            logger.warning(f"Holders/whale check failed for {ca}: {e}")
+            logger.warning("Holders/whale check failed for %s: %s", ca, e)
             return False
 
     async def process_mention(self, ca: str, channel_key: str) -> None:
-        now = _now_utc()
-        arr = self.state.mentions_by_ca.setdefault(ca, [])
-        arr.append(Mention(now, channel_key, 3, 1.0))
+        now_ts = _now_ts()
+        arr = self.state.mentions_by_ca.get(ca)
+        if arr is None:
+            arr = self.state.mentions_by_ca[ca] = deque()
+            heapq.heappush(self.state.mention_expiry, (now_ts + _MENTION_RETENTION_SEC, ca))
+        # Interned so every stored mention shares one str per channel and set/dict lookups
+        # on it hit the identity fast path
+        channel_key = sys.intern(channel_key)
+        channel_id = self.state.channel_ids.get(channel_key)
+        if channel_id is None:
+            channel_id = self.state.channel_ids[channel_key] = len(self.state.channel_ids)
+        mention = Mention(now_ts, channel_key, 3, 1.0, channel_id)
+        arr.append(mention)
         # first seen timestamp
         if ca not in self.state.first_seen_ts:
-            self.state.first_seen_ts[ca] = now
-
-        # Keep only last 3 hours
-        three_hours_ago = now - timedelta(hours=3)
-        self.state.mentions_by_ca[ca] = [m for m in arr if m.timestamp_utc >= three_hours_ago]
-
-        # Compute decayed score and unique recent channels
-        decayed_sum = 0.0
-        unique_channels_recent: Set[str] = set()
-        for m in self.state.mentions_by_ca[ca]:
-            age_min = (now - m.timestamp_utc).total_seconds() / 60.0
-            decayed_sum += m.weight * _decay_multiplier(age_min)
-            if age_min <= OVERLAP_WINDOW_MIN:
-                unique_channels_recent.add(m.channel)
-
-        # Compute short-window velocities regardless of market/safety
-        def mentions_in_window(minutes: int) -> int:
-            cutoff = now - timedelta(minutes=minutes)
-            return sum(1 for m in self.state.mentions_by_ca[ca] if m.timestamp_utc >= cutoff)
-
-        vel5 = mentions_in_window(VEL5_WINDOW_MIN)
-        vel10 = mentions_in_window(VEL10_WINDOW_MIN)
-
-        # Market and safety data
-        mint_revoked, freeze_revoked = await self.ensure_safety_checked(ca)
+            self.state.first_seen_ts[ca] = now_ts
+            self.state.dirty = True
+
+        # Keep only last 3 hours; mentions arrive in order so expired ones sit at the left
+        self._expire_mentions(ca, arr, now_ts - _MENTION_RETENTION_SEC, now_ts)
+
+        # Decayed score is maintained incrementally: decay the previous total to now and
+        # add the new mention, instead of re-evaluating exp() for every stored mention
+        decayed_sum = self._decayed_score(ca, now_ts) + mention.weight
+        self.state.decayed_score_by_ca[ca] = (decayed_sum, now_ts)
+
+        k_unique, vel5, vel10 = _window_stats(arr, now_ts, _OVERLAP_SEC, _VEL5_SEC, _VEL10_SEC)
+
+        # Market and safety data; on a dex cache miss both lookups go out concurrently
         dex = self.state.dex_cache.get(ca)
-        if not dex or (now - dex.get('ts', now)).total_seconds() > 60:
-            d = await get_dex_metrics(ca)
-            d['ts'] = now
-            self.state.dex_cache[ca] = d
-            dex = d
+        if dex is None:
+            (mint_revoked, freeze_revoked), dex = await asyncio.gather(
+                self.ensure_safety_checked(ca), self._fetch_dex(ca)
+            )
+        else:
+            mint_revoked, freeze_revoked = await self.ensure_safety_checked(ca)
 
         safe_ok = (mint_revoked and freeze_revoked) if MINT_SAFETY_REQUIRED else True
-        liquidity_usd = float(dex.get('liquidity_usd', 0) if dex else 0)
+        # Pull every market scalar out of the dex dict once; the tier checks below only touch locals
+        d = dex or {}
+        liquidity_usd = float(d.get('liquidity_usd') or 0)
+        volume24_usd = float(d.get('volume24_usd') or 0)
+        symbol = d.get('symbol')
+        market_cap_usd = float(d.get('market_cap_usd') or 0)
+        txns_h1_total = int(d.get('txns_h1_total') or 0)
+        bs_ratio = float(d.get('buy_sell_ratio_h1') or 0)
+        price_change_m15 = float(d.get('price_change_m15') or 0)
+        pair_created_s = d.get('pair_created_s')
+        trending = bool(d.get('trending') or False)
+        price_usd_cur = float(d.get('price_usd') or 0)
         if liquidity_usd > 0:
             prev_peak = self.state.peak_liquidity_usd.get(ca, 0.0)
             if liquidity_usd > prev_peak:
                 self.state.peak_liquidity_usd[ca] = liquidity_usd
-        volume24_usd = float(dex.get('volume24_usd', 0) if dex else 0)
-        symbol = (dex or {}).get('symbol')
-        market_cap_usd = float((dex or {}).get('market_cap_usd') or 0)
-        txns_h1_total = int((dex or {}).get('txns_h1_total') or 0)
-        bs_ratio = float((dex or {}).get('buy_sell_ratio_h1') or 0)
-        price_change_m15 = float((dex or {}).get('price_change_m15') or 0)
-        pair_created_ms = (dex or {}).get('pair_created_ms')
-        trending = bool((dex or {}).get('trending') or False)
+                self.state.dirty = True
 
         market_sane = liquidity_usd >= LIQ_MIN_USD and volume24_usd >= VOL24_MIN_USD
 
         classification: Optional[str] = None
-        k_unique = len(unique_channels_recent)
+        vip_count = len(self.state.vip_holders_by_ca.get(ca, ()))
         if safe_ok:
-            # Tier 2 (Confirmation) — age 30–90 min window
-            age_min = None
-            if pair_created_ms:
-                try:
-                    age_min = max(0.0, (now - datetime.fromtimestamp(pair_created_ms / 1000.0, tz=timezone.utc)).total_seconds() / 60.0)
-                except Exception:
-                    age_min = None
-            if age_min is None and ca in self.state.first_seen_ts:
-                age_min = (now - self.state.first_seen_ts[ca]).total_seconds() / 60.0
-
-            if age_min is not None and T2_AGE_MIN_MINUTES <= age_min <= T2_AGE_MAX_MINUTES:
-                # Holders and whales check using RPC
-                holders_ok = False
-                try:
-                    holders_ok = await self.holders_and_whales_ok(ca)
-                except Exception:
-                    holders_ok = False
+            age_min = _compute_age_minutes(now_ts, pair_created_s, self.state.first_seen_ts.get(ca))
 
+            # Tier 2 (Confirmation) — age 30–90 min window
+            if self._t2_in_window(age_min):
                 peak_liq = self.state.peak_liquidity_usd.get(ca, liquidity_usd)
                 drawdown_pct = 0.0
                 if peak_liq > 0:
                     drawdown_pct = max(0.0, (peak_liq - liquidity_usd) / peak_liq * 100.0)
 
-                if (
-                    holders_ok and
-                    liquidity_usd >= max(LIQ_MIN_USD, T2_LIQ_MIN_USD) and
-                    drawdown_pct <= T2_LIQ_DRAWDOWN_MAX_PCT and
-                    txns_h1_total >= T2_TXNS_H1_MIN and
-                    bs_ratio >= T2_BUY_SELL_RATIO_MIN and
-                    len(self.state.vip_holders_by_ca.get(ca, set())) >= 1
-                ):
-                    classification = 'T2'
+                # Local checks first so rejects never pay for the holders RPC round-trip
+                if self._t2_market_ok(liquidity_usd, drawdown_pct, txns_h1_total, bs_ratio, vip_count):
+                    # Holders and whales check using RPC
+                    holders_ok = False
+                    try:
+                        holders_ok = await self.holders_and_whales_ok(ca)
+                    except Exception:
+                        holders_ok = False
+                    if holders_ok:
+                        classification = 'T2'
 
             # Tier 3 (Momentum) — 2–4 hour window after launch
             if not classification:
-                if age_min is None and ca in self.state.first_seen_ts:
-                    age_min = (now - self.state.first_seen_ts[ca]).total_seconds() / 60.0
-                price_ok = True
-                if 'price_usd' in (dex or {}) and ca in self.state.t1_price_usd:
-                    try:
-                        cur = float(dex.get('price_usd') or 0)
-                        base = float(self.state.t1_price_usd.get(ca) or 0)
-                        if cur > 0 and base > 0:
-                            multiple = cur / base
-                            price_ok = (multiple >= T3_PRICE_MIN_X and multiple < T3_PRICE_MAX_X)
-                    except Exception:
-                        price_ok = True
-                trend_ok = (price_change_m15 > 0.0) if T3_POS_TREND_REQUIRED else True
-                if (
-                    (age_min is None or (T3_AGE_MIN_MINUTES <= age_min <= T3_AGE_MAX_MINUTES)) and
-                    market_cap_usd >= T3_MCAP_MIN_USD and
-                    volume24_usd >= T3_VOL24_MIN_USD and
-                    price_ok and
-                    trend_ok
-                ):
+                multiple: Optional[float] = None
+                base = float(self.state.t1_price_usd.get(ca) or 0)
+                if price_usd_cur > 0 and base > 0:
+                    multiple = price_usd_cur / base
+                if self._t3_market_ok(age_min, market_cap_usd, volume24_usd, multiple, price_change_m15):
                     # holders threshold for T3 using RPC
                     holders3_ok = False
                     try:
@@ -336,63 +510,66 @@ class Evaluator:
         if prev and order.get(prev, 0) >= order.get(classification, 0):
             return
 
-        if classification == 'T1' and ca not in self.state.t1_price_usd:
-            if dex and dex.get('price_usd'):
-                try:
-                    self.state.t1_price_usd[ca] = float(dex['price_usd'])
-                except Exception:
-                    pass
+        if classification == 'T1' and ca not in self.state.t1_price_usd and price_usd_cur:
+            self.state.t1_price_usd[ca] = price_usd_cur
+            self.state.dirty = True
 
-        channels_line = _summarize_channels(self.state.mentions_by_ca.get(ca, []))
+        channels_line = _summarize_channels(arr)
         holders_str = '-'
         # Note: Holder count not available without Birdeye API
 
-        msg = (
-            f"{'🔥 Consensus T1' if classification=='T1' else ('🚀 UPGRADE: T2' if classification=='T2' else '🚀🚀 UPGRADE: T3')} — ${symbol or '?'}\n"
-            f"CA: {ca} ({ca[:4]}...{ca[-4:]})\n"
-            f"Mentions: {len(self.state.mentions_by_ca.get(ca, []))} | Unique {OVERLAP_WINDOW_MIN}m: {len(unique_channels_recent)} ({channels_line})\n"
-            f"Velocity: {vel5}/{VEL5_WINDOW_MIN}m, {vel10}/{VEL10_WINDOW_MIN}m | VIP: {len(self.state.vip_holders_by_ca.get(ca, set()))}\n"
-            f"Liquidity: ${int(liquidity_usd):,} | Vol24: ${int(volume24_usd):,} | Mcap: ${int(market_cap_usd):,} | Holders: {holders_str}\n"
-            f"Txns(h1): {txns_h1_total} | Buy/Sell: {bs_ratio:.2f} | 15m: {price_change_m15:+.1f}%{' | 🔥Trending' if trending else ''}\n"
-            f"Safety: {'✅' if mint_revoked else '❌'} Mint revoked, {'✅' if freeze_revoked else '❌'} Freeze revoked\n"
-        )
+        n_mentions = len(arr)
+        ca_short = f"{ca[:4]}...{ca[-4:]}"
+        msg = "\n".join((
+            f"{_ALERT_TITLES[classification]} — ${symbol or '?'}",
+            f"CA: {ca} ({ca_short})",
+            f"Mentions: {n_mentions} | Unique {OVERLAP_WINDOW_MIN}m: {k_unique} ({channels_line})",
+            f"Velocity: {vel5}/{VEL5_WINDOW_MIN}m, {vel10}/{VEL10_WINDOW_MIN}m | VIP: {vip_count}",
+            f"Liquidity: ${int(liquidity_usd):,} | Vol24: ${int(volume24_usd):,} | Mcap: ${int(market_cap_usd):,} | Holders: {holders_str}",
+            f"Txns(h1): {txns_h1_total} | Buy/Sell: {bs_ratio:.2f} | 15m: {price_change_m15:+.1f}%{' | 🔥Trending' if trending else ''}",
+            f"Safety: {'✅' if mint_revoked else '❌'} Mint revoked, {'✅' if freeze_revoked else '❌'} Freeze revoked",
+            "",
+        ))
 
         await self.send_message(ca, classification, msg)
         self.state.last_rank_sent[ca] = classification
-        logger.info(f"Consensus alert sent [{classification}] for {ca} (unique={len(unique_channels_recent)})")
+        self.state.dirty = True
+        logger.info("Consensus alert sent [%s] for %s (unique=%d)", classification, ca, k_unique)
 
         # Record a structured signal snapshot for analytics
         try:
             if self.stats:
+                channels = [m.channel for m in arr]
                 ev = SignalEvent(
-                    ts_utc=datetime.now(timezone.utc).isoformat(),
+                    # Same instant the mention was evaluated at; no second clock read
+                    ts_utc=datetime.fromtimestamp(now_ts, tz=timezone.utc).isoformat(),
                     ca=ca,
                     symbol=symbol,
                     classification=classification,
-                    source_channels=[m.channel for m in self.state.mentions_by_ca.get(ca, [])[:5]],
-                    uniques_OverlapMin=len(set([m.channel for m in self.state.mentions_by_ca.get(ca, [])])),
-                    mentions_total=len(self.state.mentions_by_ca.get(ca, [])),
+                    source_channels=channels[:5],
+                    uniques_OverlapMin=len(set(channels)),
+                    mentions_total=n_mentions,
                     liquidity_usd=liquidity_usd,
                     volume24_usd=volume24_usd,
                     market_cap_usd=market_cap_usd,
                     txns_h1_total=txns_h1_total,
                     buy_sell_ratio_h1=bs_ratio,
                     price_change_m15=price_change_m15,
-                    price_usd=float(dex.get('price_usd') or 0) if dex and dex.get('price_usd') else None,
+                    price_usd=price_usd_cur or None,
                 )
                 await self.stats.record_signal(ev)
         except Exception:
             pass
 
 
-def parse_mint_safety(data: bytes) -> Tuple[bool, bool]:
-    try:
-        if len(data) < 82:
-            return False, False
-        mint_auth_opt = int.from_bytes(data[0:4], 'little')
-        freeze_auth_opt = int.from_bytes(data[45:49], 'little')
-        return (mint_auth_opt == 0), (freeze_auth_opt == 0)
-    except Exception:
-        return False, False
+# SPL Mint layout: u32 COption tag for mint_authority at offset 0, freeze_authority tag at 45;
+# one Struct skips the 41 bytes between them so both tags come out of a single C call
+_MINT_LAYOUT_LEN = 82
+_MINT_TAGS = struct.Struct('<I41xI').unpack_from
 
 
+def parse_mint_safety(data: bytes) -> Tuple[bool, bool]:
+    if len(data) < _MINT_LAYOUT_LEN:
+        return False, False
+    mint_tag, freeze_tag = _MINT_TAGS(data, 0)
+    return mint_tag == 0, freeze_tag == 0
@@ -2,23 +2,23 @@ import asyncio
 import logging
 import os
 import signal
+import time
 
 from config.config import setup_logging, validate_required_config, validate_ranges
 from bot.telegram import Bot
 from bot.apis import http_client
 from bot.apis import get_dex_metrics
-from config.config import STATS_SNAPSHOT_INTERVAL_SEC
+from config.config import STATS_SNAPSHOT_INTERVAL_SEC, STATS_SNAPSHOT_CONCURRENCY, STATS_MAINTENANCE_INTERVAL_SEC
 from bot.vip import vip_watcher_loop
 from config.config import ENABLE_STATS
-from config.config import METRICS_ENABLED, METRICS_PORT
+from config.config import METRICS_ENABLED, METRICS_PORT, METRICS_SCRAPE_PORT, USE_UVLOOP
 from bot.metrics import start_observability_server, loop_duration_seconds
 
 
 async def _run() -> None:
     # Ensure var/ directories exist for logs/state/sessions
     try:
-        import os as _os
-        _os.makedirs("var", exist_ok=True)
+        os.makedirs("var", exist_ok=True)
     except Exception:
         pass
     setup_logging()
@@ -28,7 +28,9 @@ async def _run() -> None:
     bot = Bot()
     if METRICS_ENABLED:
         # Start observability server (metrics + health) with real bot reference
-        asyncio.create_task(start_observability_server(bot=bot, http_client=http_client, port=METRICS_PORT))
+        asyncio.create_task(start_observability_server(
+            bot=bot, http_client=http_client, port=METRICS_PORT, scrape_port=METRICS_SCRAPE_PORT
+        ))
     await http_client.start()
 
     
@@ -46,24 +48,40 @@ async def _run() -> None:
     # Background: market snapshots loop to persist time-series data and derive outcomes accurately
     if ENABLE_STATS and getattr(bot, 'stats', None):
         async def _snapshots_loop() -> None:
+            # The pass is network-bound: fetch CAs concurrently, bounded so we stay under provider limits
+            snapshot_sem = asyncio.Semaphore(max(1, STATS_SNAPSHOT_CONCURRENCY))
+
+            async def _fetch_one(ca: str):
+                async with snapshot_sem:
+                    try:
+                        return ca, await get_dex_metrics(ca)
+                    except Exception:
+                        return ca, None
+
+            async def _outcomes_one(ca: str) -> None:
+                async with snapshot_sem:
+                    try:
+                        await bot.stats.maybe_record_outcomes_from_snapshots(ca)
+                    except Exception:
+                        pass
+
             try:
                 while not stop_event.is_set():
                     await asyncio.sleep(max(15, STATS_SNAPSHOT_INTERVAL_SEC))
                     try:
                         if getattr(bot, 'stats', None) and bot.stats.enabled:
-                            import time as _time
-                            _start = _time.perf_counter()
+                            _start = time.perf_counter()
                             cas = list(getattr(bot, 'coin_counts', {}).keys())[:500]
-                            for ca in cas:
-                                try:
-                                    metrics = await get_dex_metrics(ca)
-                                    if metrics:
-                                        await bot.stats.record_snapshot(ca, metrics)
-                                        # Opportunistically compute outcomes from snapshots
-                                        await bot.stats.maybe_record_outcomes_from_snapshots(ca)
-                                except Exception:
-                                    continue
-                            loop_duration_seconds.labels("snapshots").observe(_time.perf_counter() - _start)
+                            fetched = await asyncio.gather(*(_fetch_one(ca) for ca in cas))
+                            rows = [(ca, metrics) for ca, metrics in fetched if metrics]
+                            # One transaction for the whole pass instead of a connect+commit per CA
+                            try:
+                                await bot.stats.record_snapshots_bulk(rows)
+                            except Exception:
+                                rows = []
+                            # Opportunistically compute outcomes from snapshots
+                            await asyncio.gather(*(_outcomes_one(ca) for ca, _ in rows))
+                            loop_duration_seconds.labels("snapshots").observe(time.perf_counter() - _start)
                     except Exception:
                         pass
             except asyncio.CancelledError:
@@ -71,16 +89,14 @@ async def _run() -> None:
         asyncio.create_task(_snapshots_loop())
 
         # Maintenance loop (VACUUM, JSONL rotation)
-        from config.config import STATS_MAINTENANCE_INTERVAL_SEC
         async def _maintenance_loop() -> None:
             try:
                 while not stop_event.is_set():
                     await asyncio.sleep(STATS_MAINTENANCE_INTERVAL_SEC)
                     try:
-                        import time as _time
-                        _start = _time.perf_counter()
+                        _start = time.perf_counter()
                         await bot.stats.maybe_maintain_storage()
-                        loop_duration_seconds.labels("maintenance").observe(_time.perf_counter() - _start)
+                        loop_duration_seconds.labels("maintenance").observe(time.perf_counter() - _start)
                     except Exception:
                         pass
             except asyncio.CancelledError:
@@ -116,6 +132,13 @@ def main() -> None:
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
         except Exception:
             pass
+    elif USE_UVLOOP:
+        # Optional drop-in loop with faster socket dispatch; stdlib asyncio if not installed
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
     asyncio.run(_run())
 
 
@@ -1,5 +1,12 @@
+import asyncio
+import concurrent.futures
 import logging
-from typing import Optional
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.config import METRICS_CACHE_TTL_SEC
+from bot.utils import json_dumps
 
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from aiohttp import web
@@ -38,59 +45,120 @@ inflight_rpc = Gauge("inflight_rpc", "In-flight Solana RPC requests")
 inflight_http = Gauge("inflight_http", "In-flight HTTP requests")
 
 
-async def _health_handler(request: web.Request) -> web.Response:
-    # Dependencies injected via app context
-    bot = request.app["bot"]
-    http_client = request.app["http_client"]
-    ok = True
-    details = {}
-    try:
-        details["telegram_connected"] = bool(getattr(bot.client, "is_connected", False))
-        details["http_session"] = bool(http_client.session and not http_client.session.closed)
-        ok = details["telegram_connected"] and details["http_session"]
-    except Exception as e:
-        ok = False
-        details["error"] = str(e)
-    return web.json_response({"ok": ok, **details}, status=200 if ok else 503)
-
-
-async def _ready_handler(request: web.Request) -> web.Response:
-    bot = request.app["bot"]
-    http_client = request.app["http_client"]
-    ok = True
-    details = {}
-    try:
-        tg_ok = bool(getattr(bot.client, "is_connected", False))
-        http_ok = bool(http_client.session and not http_client.session.closed)
-        stats_ok = True
-        if getattr(bot, "stats", None) and bot.stats.enabled:
-            stats_ok = bool(getattr(bot.stats, "_initialized", False))
-        ok = tg_ok and http_ok and stats_ok
-        details.update({"telegram_connected": tg_ok, "http_session": http_ok, "stats_initialized": stats_ok})
-    except Exception as e:
-        ok = False
-        details["error"] = str(e)
-    return web.json_response({"ok": ok, **details}, status=200 if ok else 503)
+def _make_probe_handlers(bot, http_client) -> Tuple[Callable[[web.Request], Awaitable[web.Response]], ...]:
+    """Build /healthz and /readyz handlers bound to ``bot``/``http_client``.
 
+    Probe results take only a handful of shapes, so response bodies are encoded once per shape.
+    """
+    bodies: Dict[Tuple[Any, ...], bytes] = {}
 
-async def _metrics_handler(_request: web.Request) -> web.Response:
-    payload = generate_latest()
-    return web.Response(body=payload, headers={"Content-Type": CONTENT_TYPE_LATEST})
+    def _respond(ok: bool, details: Dict[str, Any]) -> web.Response:
+        key = (ok, *details.items())
+        body = bodies.get(key)
+        if body is None:
+            body = bodies[key] = json_dumps({"ok": ok, **details})
+        return web.Response(body=body, status=200 if ok else 503, content_type="application/json")
+
+    def _error(e: Exception) -> web.Response:
+        body = json_dumps({"ok": False, "error": str(e)})
+        return web.Response(body=body, status=503, content_type="application/json")
+
+    def _telegram_ok() -> bool:
+        return bool(getattr(bot.client, "is_connected", False))
+
+    def _http_ok() -> bool:
+        session = http_client.session
+        return bool(session and not session.closed)
+
+    async def health(_request: web.Request) -> web.Response:
+        try:
+            tg_ok = _telegram_ok()
+            http_ok = _http_ok()
+        except Exception as e:
+            return _error(e)
+        return _respond(tg_ok and http_ok, {"telegram_connected": tg_ok, "http_session": http_ok})
+
+    async def ready(_request: web.Request) -> web.Response:
+        try:
+            tg_ok = _telegram_ok()
+            http_ok = _http_ok()
+            stats_ok = True
+            if getattr(bot, "stats", None) and bot.stats.enabled:
+                stats_ok = bool(getattr(bot.stats, "_initialized", False))
+        except Exception as e:
+            return _error(e)
+        return _respond(
+            tg_ok and http_ok and stats_ok,
+            {"telegram_connected": tg_ok, "http_session": http_ok, "stats_initialized": stats_ok},
+        )
+
+    return health, ready
 
 
-async def start_observability_server(bot, http_client, port: int) -> None:
+@dataclass
+class _MetricsCache:
+    body: bytes = b""
+    exp: float = 0.0  # loop.time() after which the body is re-rendered
+
+
+# Last rendered /metrics body; concurrent scrapes within the TTL share one generate_latest() call
+_metrics_cache = _MetricsCache()
+_metrics_lock: Optional[asyncio.Lock] = None
+
+
+async def _metrics_handler(_request: web.Request) -> web.Response:
+    global _metrics_lock
+    loop = asyncio.get_running_loop()
+    if loop.time() >= _metrics_cache.exp:
+        if _metrics_lock is None:
+            _metrics_lock = asyncio.Lock()
+        async with _metrics_lock:
+            if loop.time() >= _metrics_cache.exp:
+                # Registry walk is CPU-bound; keep it off the loop so /healthz and app I/O don't stall
+                _metrics_cache.body = await asyncio.to_thread(generate_latest)
+                _metrics_cache.exp = loop.time() + METRICS_CACHE_TTL_SEC
+    return web.Response(body=_metrics_cache.body, headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
+def _start_metrics_thread(port: int) -> "concurrent.futures.Future[None]":
+    """Serve /metrics from its own event loop on a daemon thread; resolves once the socket is bound."""
+    started: "concurrent.futures.Future[None]" = concurrent.futures.Future()
+
+    def _run() -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            app = web.Application()
+            app.add_routes([web.get("/metrics", _metrics_handler)])
+            runner = web.AppRunner(app)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.TCPSite(runner, host="0.0.0.0", port=port).start())
+        except BaseException as e:
+            started.set_exception(e)
+            loop.close()
+            return
+        started.set_result(None)
+        loop.run_forever()
+
+    threading.Thread(target=_run, name="metrics-http", daemon=True).start()
+    return started
+
+
+async def start_observability_server(bot, http_client, port: int, scrape_port: int = 0) -> None:
+    """Serve /healthz and /readyz (and /metrics unless ``scrape_port`` moves it to its own thread)."""
     app = web.Application()
-    app["bot"] = bot
-    app["http_client"] = http_client
-    app.add_routes([
-        web.get("/metrics", _metrics_handler),
-        web.get("/healthz", _health_handler),
-        web.get("/readyz", _ready_handler),
-    ])
+    health, ready = _make_probe_handlers(bot, http_client)
+    routes = [web.get("/healthz", health), web.get("/readyz", ready)]
+    if scrape_port:
+        # Scrapes get their own loop so a slow render can't delay probes or Telegram handling
+        await asyncio.wrap_future(_start_metrics_thread(scrape_port))
+        logger.info(f"Metrics server listening on :{scrape_port} (/metrics, dedicated thread)")
+    else:
+        routes.append(web.get("/metrics", _metrics_handler))
+    app.add_routes(routes)
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, host="0.0.0.0", port=port)
     await site.start()
-    logger.info(f"Observability server listening on :{port} (/metrics,/healthz,/readyz)")
-
-
+    paths = "/healthz,/readyz" if scrape_port else "/metrics,/healthz,/readyz"
+    logger.info(f"Observability server listening on :{port} ({paths})")
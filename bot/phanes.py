@@ -7,18 +7,30 @@ from config.config import (
     PHANES_API_KEY,
 )
 from bot.apis import http_client
+from bot.utils import json_dumps
 
 
 logger = logging.getLogger(__name__)
 
 
-def _headers() -> Dict[str, str]:
+def _build_headers() -> Dict[str, str]:
     h: Dict[str, str] = {"Content-Type": "application/json", "user-agent": "callsbot/phanes-integration"}
     if PHANES_API_KEY:
         h["authorization"] = f"Bearer {PHANES_API_KEY}"
     return h
 
 
+# Config is fixed for the process lifetime, so headers and envelope prefixes are built once
+_HEADERS = _build_headers()
+_SIGNAL_ENVELOPE = b'{"type":"signal","source":"callsbot","version":1,"data":'
+_OUTCOME_ENVELOPE = b'{"type":"outcome","source":"callsbot","version":1,"data":'
+
+
+def _envelope(prefix: bytes, obj: Dict[str, Any]) -> bytes:
+    """Encode ``{type,source,version,data}`` by splicing the encoded data into a constant prefix."""
+    return prefix + json_dumps(obj) + b"}"
+
+
 def phanes_is_enabled() -> bool:
     return bool(PHANES_ENABLED and PHANES_WEBHOOK_URL)
 
@@ -26,14 +38,8 @@ def phanes_is_enabled() -> bool:
 async def phanes_forward_signal(signal_obj: Dict[str, Any]) -> None:
     if not phanes_is_enabled():
         return
-    payload: Dict[str, Any] = {
-        "type": "signal",
-        "source": "callsbot",
-        "version": 1,
-        "data": signal_obj,
-    }
     try:
-        await http_client.post_json(PHANES_WEBHOOK_URL, payload, headers=_headers())
+        await http_client.post_json(PHANES_WEBHOOK_URL, _envelope(_SIGNAL_ENVELOPE, signal_obj), headers=_HEADERS)
     except Exception as e:
         logger.warning(f"Phanes forward signal failed: {e}")
 
@@ -41,15 +47,7 @@ async def phanes_forward_signal(signal_obj: Dict[str, Any]) -> None:
 async def phanes_forward_outcome(outcome_obj: Dict[str, Any]) -> None:
     if not phanes_is_enabled():
         return
-    payload: Dict[str, Any] = {
-        "type": "outcome",
-        "source": "callsbot",
-        "version": 1,
-        "data": outcome_obj,
-    }
     try:
-        await http_client.post_json(PHANES_WEBHOOK_URL, payload, headers=_headers())
+        await http_client.post_json(PHANES_WEBHOOK_URL, _envelope(_OUTCOME_ENVELOPE, outcome_obj), headers=_HEADERS)
     except Exception as e:
         logger.warning(f"Phanes forward outcome failed: {e}")
-
-
@@ -1,9 +1,12 @@
 import asyncio
 import json
+import logging
 import os
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from config.config import (
     ENABLE_STATS,
@@ -14,13 +17,58 @@ from config.config import (
     STATS_DAILY_ROLLOVER_HOUR_UTC,
     STATS_DB_PATH,
     STATS_SNAPSHOT_INTERVAL_SEC,
+    STATS_SNAPSHOT_DB_PATH,
 )
 from config.config import STATS_JSONL_MAX_BYTES, STATS_MAX_JSONL_FILES, STATS_RETENTION_DAYS
+from config.config import STATS_WRITE_BATCH_MAX, STATS_WRITE_FLUSH_MS
 from bot.phanes import phanes_forward_signal, phanes_forward_outcome, phanes_is_enabled
+from bot.utils import json_dumps
+
+
+logger = logging.getLogger(__name__)
+
+
+# Whole-second "YYYY-MM-DDTHH:MM:SS" prefix, re-rendered only when the second changes
+_iso_prefix_sec = -1
+_iso_prefix = ""
+
+
+def _utc_now_iso_ms() -> Tuple[str, int]:
+    """Current UTC time as (isoformat with microseconds, epoch ms), without building a datetime."""
+    global _iso_prefix_sec, _iso_prefix
+    t = time.time()
+    sec = int(t)
+    if sec != _iso_prefix_sec:
+        _iso_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_prefix_sec = sec
+    micros = int((t - sec) * 1e6)
+    return f"{_iso_prefix}.{micros:06d}+00:00", sec * 1000 + micros // 1000
 
 
 def _utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return _utc_now_iso_ms()[0]
+
+
+def _ts_pair(ts_utc: Optional[str]) -> Tuple[str, Optional[int]]:
+    """(ts_utc, ts_ms) for a caller-supplied ISO timestamp, or for now when None."""
+    if ts_utc is None:
+        return _utc_now_iso_ms()
+    return ts_utc, _iso_to_ms(ts_utc)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def _iso_to_ms(ts: str) -> Optional[int]:
+    """UTC epoch milliseconds for an ISO timestamp (naive means UTC); None if unparseable."""
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_MS
 
 
 def _ensure_dir(path: str) -> None:
@@ -55,9 +103,163 @@ class OutcomeEvent:
     price_end_usd: Optional[float]
 
 
+def _coin_rows(ca: str, symbol: Optional[str], pair_created_ms: Optional[int], seen_ts: str) -> List[Tuple[str, Tuple[Any, ...]]]:
+    created = int(pair_created_ms or 0)
+    return [
+        # If not exists, create with first_seen_ts
+        (_COIN_INSERT_SQL, (ca, seen_ts, seen_ts, symbol, created)),
+        # Always update last_seen, and optionally symbol/pair_created_ms
+        (_COIN_UPDATE_SQL, (seen_ts, symbol, created, created, ca)),
+    ]
+
+
+def _signal_to_dict(s: SignalEvent) -> Dict[str, Any]:
+    # Flat field copy; dataclasses.asdict() recurses and deep-copies every value
+    return {
+        "ts_utc": s.ts_utc,
+        "ca": s.ca,
+        "symbol": s.symbol,
+        "classification": s.classification,
+        "source_channels": s.source_channels,
+        "uniques_OverlapMin": s.uniques_OverlapMin,
+        "mentions_total": s.mentions_total,
+        "liquidity_usd": s.liquidity_usd,
+        "volume24_usd": s.volume24_usd,
+        "market_cap_usd": s.market_cap_usd,
+        "txns_h1_total": s.txns_h1_total,
+        "buy_sell_ratio_h1": s.buy_sell_ratio_h1,
+        "price_change_m15": s.price_change_m15,
+        "price_usd": s.price_usd,
+    }
+
+
+def _outcome_to_dict(o: OutcomeEvent) -> Dict[str, Any]:
+    return {
+        "ts_utc": o.ts_utc,
+        "ca": o.ca,
+        "horizon_min": o.horizon_min,
+        "roi_pct": o.roi_pct,
+        "price_start_usd": o.price_start_usd,
+        "price_end_usd": o.price_end_usd,
+    }
+
+
+def _outcome_row(o: OutcomeEvent) -> Tuple[Any, ...]:
+    return (o.ts_utc, o.ca, o.horizon_min, o.roi_pct, o.price_start_usd, o.price_end_usd)
+
+
+_COIN_INSERT_SQL = "INSERT OR IGNORE INTO coins(ca, first_seen_ts, last_seen_ts, symbol, pair_created_ms) VALUES(?, ?, ?, ?, ?)"
+_COIN_UPDATE_SQL = (
+    "UPDATE coins SET last_seen_ts = ?, symbol = COALESCE(?, symbol), "
+    "pair_created_ms = CASE WHEN ? > 0 THEN ? ELSE pair_created_ms END WHERE ca = ?"
+)
+_SNAPSHOT_INSERT_SQL = """
+    INSERT OR IGNORE INTO snapshots(
+        ts_utc, ca, price_usd, liquidity_usd, volume24_usd, volume1h_usd, market_cap_usd,
+        txns_h1_total, buy_sell_ratio_h1, price_change_m5, price_change_m15, price_change_h1,
+        pair_created_ms, trending, ts_ms
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_MENTION_INSERT_SQL = "INSERT OR IGNORE INTO mentions(ts_utc, ca, channel, message_id, ts_ms) VALUES(?, ?, ?, ?, ?)"
+_HOLDERS_INSERT_SQL = (
+    "INSERT OR REPLACE INTO holders(ts_utc, ca, supply, largest_wallet_pct, approx_unique_holders, ts_ms) "
+    "VALUES(?, ?, ?, ?, ?, ?)"
+)
+_VIP_HOLDER_INSERT_SQL = "INSERT OR IGNORE INTO vip_holders(ts_utc, ca, wallet) VALUES(?, ?, ?)"
+_SIGNAL_INSERT_SQL = """
+    INSERT INTO signals (
+        ts_utc, ca, symbol, classification, source_channels, uniques_overlap_min, mentions_total,
+        liquidity_usd, volume24_usd, market_cap_usd, txns_h1_total, buy_sell_ratio_h1, price_change_m15, price_usd
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SIGNAL_FIRST_TS_SQL = "SELECT MIN(ts_utc) FROM signals WHERE ca = ?"
+_SNAPSHOT_PRICE_AT_SQL = "SELECT price_usd FROM snapshots WHERE ca = ? AND ts_ms <= ? ORDER BY ts_ms DESC LIMIT 1"
+_OUTCOME_HORIZONS_SQL = "SELECT DISTINCT horizon_min FROM outcomes WHERE ca = ? AND ts_utc >= ?"
+_SNAPSHOT_PRICE_AFTER_SQL = (
+    "SELECT ts_utc, price_usd FROM snapshots WHERE ca = ? AND ts_ms >= ? "
+    "AND price_usd IS NOT NULL ORDER BY ts_ms ASC LIMIT 1"
+)
+# (schema, table) pairs that carry an epoch-ms ts_ms column next to ts_utc
+_TS_MS_TABLES = (("snap", "snapshots"), ("main", "mentions"), ("main", "holders"))
+_TS_MS_FROM_ISO_SQL = "CAST(ROUND((julianday(ts_utc) - 2440587.5) * 86400000) AS INTEGER)"
+_RETENTION_DELETE_SQL = tuple(
+    f"DELETE FROM {table} WHERE ts_utc < datetime('now', ?)" for table in ("signals", "outcomes")
+)
+_RETENTION_DELETE_MS_SQL = tuple(f"DELETE FROM {schema}.{table} WHERE ts_ms < ?" for schema, table in _TS_MS_TABLES)
+_OUTCOME_UNIQUE_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS uq_outcomes_ca_h ON outcomes(ca, horizon_min)"
+_OUTCOME_INSERT_SQL = """
+    INSERT OR IGNORE INTO outcomes (ts_utc, ca, horizon_min, roi_pct, price_start_usd, price_end_usd)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+# Writes are append-only, so WAL with NORMAL sync is safe and turns each commit into one append
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+# JSONL handles stay open; buffered lines hit disk after this many lines or seconds, whichever comes first
+_JSONL_BUFFER_BYTES = 64 * 1024
+_JSONL_FLUSH_LINES = 64
+_JSONL_FLUSH_SEC = 1.0
+_PHANES_MAX_INFLIGHT = 32
+
+
+# Attached snapshots DB: a crash may drop the last few seconds of snapshots, never corrupt the main DB
+_SNAPSHOT_PRAGMAS = (
+    "PRAGMA snap.journal_mode=MEMORY",
+    "PRAGMA snap.synchronous=OFF",
+)
+
+
+async def _apply_pragmas(db: Any) -> None:
+    for pragma in _PRAGMAS:
+        await db.execute(pragma)
+
+
+def _snapshot_row(ts: str, ts_ms: Optional[int], ca: str, metrics: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        ts,
+        ca,
+        float(metrics.get('price_usd') or 0) if metrics.get('price_usd') is not None else None,
+        float(metrics.get('liquidity_usd') or 0),
+        float(metrics.get('volume24_usd') or 0),
+        float(metrics.get('volume1h_usd') or 0),
+        float(metrics.get('market_cap_usd') or 0),
+        int(metrics.get('txns_h1_total') or 0),
+        float(metrics.get('buy_sell_ratio_h1') or 0),
+        float(metrics.get('price_change_m5') or 0),
+        float(metrics.get('price_change_m15') or 0),
+        float(metrics.get('price_change_h1') or 0),
+        int(metrics.get('pair_created_ms') or 0),
+        1 if metrics.get('trending') else 0,
+        ts_ms,
+    )
+
+
+def _skip_phanes(fn: Callable[[Dict[str, Any]], Awaitable[None]], obj: Dict[str, Any]) -> None:
+    return
+
+
 class StatsRecorder:
+    """Stats sink; with ENABLE_STATS off, construction yields a _NoopStatsRecorder instead."""
+
+    def __new__(cls) -> "StatsRecorder":
+        # Picked once at construction so the enabled recorder's hot paths carry no enabled checks
+        if cls is StatsRecorder and not ENABLE_STATS:
+            cls = _NoopStatsRecorder
+        return super().__new__(cls)
+
     def __init__(self) -> None:
-        self.enabled = ENABLE_STATS
+        self.enabled = True
         self.dir = STATS_DIR
         self.signals_path = os.path.join(self.dir, STATS_FILE_SIGNALS)
         self.outcomes_path = os.path.join(self.dir, STATS_FILE_OUTCOMES)
@@ -67,397 +269,599 @@ class StatsRecorder:
         self._start_price_by_ca: Dict[str, float] = {}
         self._db_path = STATS_DB_PATH
         self._initialized = False
-        self._phanes_enabled = phanes_is_enabled()
+        if not phanes_is_enabled():
+            # Bound per instance so record_* call it unconditionally
+            self._forward_phanes = _skip_phanes  # type: ignore[method-assign]
+        # One long-lived connection; writes are queued in _pending and committed in batches by _drain,
+        # scheduled with call_later so nothing sits waiting in the background between batches
+        self._db: Any = None
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._pending: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._drain_handle: Optional[asyncio.TimerHandle] = None
+        self._drain_task: Optional["asyncio.Future[None]"] = None
+        # Serializes transactions on the shared connection (write batches vs. maintenance)
+        self._db_lock: Optional[asyncio.Lock] = None
+        # path -> append handle, opened on first write and swapped on rotation
+        self._jsonl_fps: Dict[str, Any] = {}
+        self._jsonl_unflushed = 0
+        self._jsonl_flush_handle: Optional[asyncio.TimerHandle] = None
+        # CAs with every ROI horizon recorded; the snapshot loop skips their outcome queries
+        self._outcomes_complete: "set[str]" = set()
+        # Phanes forwards run in the background so record_* doesn't wait on the webhook round-trip
+        self._phanes_sem: Optional[asyncio.Semaphore] = None
+        self._phanes_tasks: "set[asyncio.Task]" = set()
+        # path -> next rotation slot (1..STATS_MAX_JSONL_FILES)
+        self._rot_idx: Dict[str, int] = {}
 
     async def init(self) -> None:
-        if self._initialized or not self.enabled:
+        if self._initialized:
             return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._initialized:
+                return
+            await self._open()
+        self._initialized = True
+
+    async def _open(self) -> None:
         import aiosqlite
         os.makedirs(os.path.dirname(self._db_path) or ".", exist_ok=True)
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS signals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts_utc TEXT,
-                    ca TEXT,
-                    symbol TEXT,
-                    classification TEXT,
-                    source_channels TEXT,
-                    uniques_overlap_min INTEGER,
-                    mentions_total INTEGER,
-                    liquidity_usd REAL,
-                    volume24_usd REAL,
-                    market_cap_usd REAL,
-                    txns_h1_total INTEGER,
-                    buy_sell_ratio_h1 REAL,
-                    price_change_m15 REAL,
-                    price_usd REAL
-                )
-                """
+        db = aiosqlite.connect(self._db_path)
+        if isinstance(db, threading.Thread):
+            # aiosqlite runs each connection on its own thread; don't let it hold the process open
+            db.daemon = True
+        db = await db
+        self._db = db
+        await _apply_pragmas(db)
+        # Snapshots are a bulk time-series log the snapshot loop keeps re-collecting, so they live in an
+        # attached DB without fsyncs or an on-disk journal; signals/outcomes stay on the durable main DB
+        await db.execute("ATTACH DATABASE ? AS snap", (self._snapshot_db_path(),))
+        for pragma in _SNAPSHOT_PRAGMAS:
+            await db.execute(pragma)
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS signals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts_utc TEXT,
+                ca TEXT,
+                symbol TEXT,
+                classification TEXT,
+                source_channels TEXT,
+                uniques_overlap_min INTEGER,
+                mentions_total INTEGER,
+                liquidity_usd REAL,
+                volume24_usd REAL,
+                market_cap_usd REAL,
+                txns_h1_total INTEGER,
+                buy_sell_ratio_h1 REAL,
+                price_change_m15 REAL,
+                price_usd REAL
             )
-            # Time-series snapshots for market data
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts_utc TEXT,
-                    ca TEXT,
-                    price_usd REAL,
-                    liquidity_usd REAL,
-                    volume24_usd REAL,
-                    volume1h_usd REAL,
-                    market_cap_usd REAL,
-                    txns_h1_total INTEGER,
-                    buy_sell_ratio_h1 REAL,
-                    price_change_m5 REAL,
-                    price_change_m15 REAL,
-                    price_change_h1 REAL,
-                    pair_created_ms INTEGER,
-                    trending INTEGER,
-                    UNIQUE(ts_utc, ca) ON CONFLICT IGNORE
-                )
-                """
+            """
+        )
+        # Time-series snapshots for market data
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snap.snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts_utc TEXT,
+                ca TEXT,
+                price_usd REAL,
+                liquidity_usd REAL,
+                volume24_usd REAL,
+                volume1h_usd REAL,
+                market_cap_usd REAL,
+                txns_h1_total INTEGER,
+                buy_sell_ratio_h1 REAL,
+                price_change_m5 REAL,
+                price_change_m15 REAL,
+                price_change_h1 REAL,
+                pair_created_ms INTEGER,
+                trending INTEGER,
+                ts_ms INTEGER,
+                UNIQUE(ts_utc, ca) ON CONFLICT IGNORE
             )
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_snap_ca_ts ON snapshots(ca, ts_utc)")
-            # Mentions table for raw Telegram detections
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS mentions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts_utc TEXT,
-                    ca TEXT,
-                    channel TEXT,
-                    message_id TEXT,
-                    UNIQUE(ts_utc, ca, channel) ON CONFLICT IGNORE
-                )
-                """
+            """
+        )
+        await db.execute("CREATE INDEX IF NOT EXISTS snap.idx_snap_ca_ts ON snapshots(ca, ts_utc)")
+        await self._move_legacy_snapshots(db)
+        # Mentions table for raw Telegram detections
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS mentions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts_utc TEXT,
+                ca TEXT,
+                channel TEXT,
+                message_id TEXT,
+                ts_ms INTEGER,
+                UNIQUE(ts_utc, ca, channel) ON CONFLICT IGNORE
             )
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_mentions_ca_ts ON mentions(ca, ts_utc)")
-            # Basic coin directory
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS coins (
-                    ca TEXT PRIMARY KEY,
-                    chain TEXT NOT NULL DEFAULT 'solana',
-                    first_seen_ts TEXT,
-                    pair_created_ms INTEGER,
-                    symbol TEXT,
-                    last_seen_ts TEXT
-                )
-                """
+            """
+        )
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_mentions_ca_ts ON mentions(ca, ts_utc)")
+        # Basic coin directory
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS coins (
+                ca TEXT PRIMARY KEY,
+                chain TEXT NOT NULL DEFAULT 'solana',
+                first_seen_ts TEXT,
+                pair_created_ms INTEGER,
+                symbol TEXT,
+                last_seen_ts TEXT
             )
-            # Holders / concentration snapshots
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS holders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts_utc TEXT,
-                    ca TEXT,
-                    supply REAL,
-                    largest_wallet_pct REAL,
-                    approx_unique_holders INTEGER,
-                    UNIQUE(ts_utc, ca) ON CONFLICT REPLACE
-                )
-                """
+            """
+        )
+        # Holders / concentration snapshots
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS holders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts_utc TEXT,
+                ca TEXT,
+                supply REAL,
+                largest_wallet_pct REAL,
+                approx_unique_holders INTEGER,
+                ts_ms INTEGER,
+                UNIQUE(ts_utc, ca) ON CONFLICT REPLACE
             )
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_holders_ca_ts ON holders(ca, ts_utc)")
-            # VIP holder evidence
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS vip_holders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts_utc TEXT,
-                    ca TEXT,
-                    wallet TEXT,
-                    UNIQUE(ts_utc, ca, wallet) ON CONFLICT IGNORE
-                )
-                """
+            """
+        )
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_holders_ca_ts ON holders(ca, ts_utc)")
+        # VIP holder evidence
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vip_holders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts_utc TEXT,
+                ca TEXT,
+                wallet TEXT,
+                UNIQUE(ts_utc, ca, wallet) ON CONFLICT IGNORE
             )
+            """
+        )
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outcomes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts_utc TEXT,
+                ca TEXT,
+                horizon_min INTEGER,
+                roi_pct REAL,
+                price_start_usd REAL,
+                price_end_usd REAL
+            )
+            """
+        )
+        await self._migrate_ts_ms(db)
+        # One outcome per (ca, horizon): the base is always the CA's first signal. Older DBs may hold
+        # duplicates from before the index existed, so keep the first row of each pair before creating it.
+        try:
+            await db.execute(_OUTCOME_UNIQUE_INDEX_SQL)
+        except Exception:
             await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS outcomes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ts_utc TEXT,
-                    ca TEXT,
-                    horizon_min INTEGER,
-                    roi_pct REAL,
-                    price_start_usd REAL,
-                    price_end_usd REAL
-                )
-                """
+                "DELETE FROM outcomes WHERE id NOT IN (SELECT MIN(id) FROM outcomes GROUP BY ca, horizon_min)"
             )
-            await db.commit()
-        self._initialized = True
+            await db.execute(_OUTCOME_UNIQUE_INDEX_SQL)
+        await db.commit()
+        self._db_lock = asyncio.Lock()
 
-    async def record_signal(self, s: SignalEvent) -> None:
-        if not self.enabled:
+    def _snapshot_db_path(self) -> str:
+        if STATS_SNAPSHOT_DB_PATH:
+            return STATS_SNAPSHOT_DB_PATH
+        root, ext = os.path.splitext(self._db_path)
+        return f"{root}_snapshots{ext or '.db'}"
+
+    @staticmethod
+    async def _table_columns(db: Any, schema: str, table: str) -> List[str]:
+        cur = await db.execute(f"PRAGMA {schema}.table_info({table})")
+        columns = [r[1] for r in await cur.fetchall()]
+        await cur.close()
+        return columns
+
+    async def _move_legacy_snapshots(self, db: Any) -> None:
+        # Older DBs kept snapshots in the main file; copy them over once and drop the original
+        legacy = await self._table_columns(db, "main", "snapshots")
+        if not legacy:
+            return
+        current = await self._table_columns(db, "snap", "snapshots")
+        columns = ", ".join(c for c in current if c in legacy and c not in ("id", "ts_ms"))
+        await db.execute(
+            f"INSERT OR IGNORE INTO snap.snapshots ({columns}, ts_ms) SELECT {columns}, {_TS_MS_FROM_ISO_SQL} "
+            "FROM main.snapshots"
+        )
+        await db.execute("DROP TABLE main.snapshots")
+
+    @classmethod
+    async def _migrate_ts_ms(cls, db: Any) -> None:
+        # DBs created before ts_ms existed get the column added and backfilled from ts_utc once
+        for schema, table in _TS_MS_TABLES:
+            if "ts_ms" not in await cls._table_columns(db, schema, table):
+                await db.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN ts_ms INTEGER")
+                await db.execute(f"UPDATE {schema}.{table} SET ts_ms = {_TS_MS_FROM_ISO_SQL} WHERE ts_ms IS NULL")
+            await db.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_ca_ts_ms ON {table}(ca, ts_ms)")
+        # Outcome lookups only ever want priced snapshots in time order
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS snap.idx_snap_ca_ts_ms_price ON snapshots(ca, ts_ms) WHERE price_usd IS NOT NULL"
+        )
+
+    async def _write(self, sql: str, params: Tuple[Any, ...]) -> None:
+        """Queue one row; it is committed with everything else queued in the same flush window."""
+        await self.init()
+        self._pending.append((sql, params))
+        self._queued()
+
+    async def _write_many(self, items: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+        """Queue several rows back to back so they land in the same batch (one transaction)."""
+        await self.init()
+        self._pending.extend(items)
+        self._queued()
+
+    def _queued(self) -> None:
+        if len(self._pending) >= STATS_WRITE_BATCH_MAX:
+            self._schedule_drain(0.0)
+        elif self._drain_handle is None and (self._drain_task is None or self._drain_task.done()):
+            self._schedule_drain(STATS_WRITE_FLUSH_MS / 1000.0)
+
+    def _schedule_drain(self, delay: float) -> None:
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+        self._drain_handle = asyncio.get_running_loop().call_later(delay, self._start_drain)
+
+    def _start_drain(self) -> None:
+        self._drain_handle = None
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.ensure_future(self._drain())
+
+    async def _drain(self) -> None:
+        # Set by init(), which every write path awaits before queueing
+        lock = self._db_lock
+        assert lock is not None, "stats writes drained before init()"
+        # Rows queued while a batch commits are picked up by the next loop iteration
+        while self._pending:
+            batch = self._pending[:STATS_WRITE_BATCH_MAX]
+            del self._pending[:STATS_WRITE_BATCH_MAX]
+            # Consecutive rows for the same statement go out as one executemany; order across
+            # statements is preserved (e.g. coin INSERT OR IGNORE before its UPDATE)
+            groups: List[Tuple[str, List[tuple]]] = []
+            for sql, params in batch:
+                if groups and groups[-1][0] is sql:
+                    groups[-1][1].append(params)
+                else:
+                    groups.append((sql, [params]))
+            async with lock:
+                try:
+                    for sql, rows in groups:
+                        await self._db.executemany(sql, rows)
+                    await self._db.commit()
+                    continue
+                except Exception as e:
+                    logger.warning("Stats batch write of %d rows failed, retrying per statement: %s", len(batch), e)
+                    await self._rollback()
+                # Replay one statement group per transaction so a bad group only loses its own rows
+                for sql, rows in groups:
+                    try:
+                        await self._db.executemany(sql, rows)
+                        await self._db.commit()
+                    except Exception as e:
+                        logger.warning("Dropped %d stats row(s) for %r: %s", len(rows), sql, e)
+                        await self._rollback()
+
+    async def _rollback(self) -> None:
+        try:
+            await self._db.rollback()
+        except Exception:
+            pass
+
+    async def flush(self) -> None:
+        """Commit every queued write now."""
+        self._flush_jsonl()
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+            self._drain_handle = None
+        while self._pending or (self._drain_task is not None and not self._drain_task.done()):
+            if self._drain_task is None or self._drain_task.done():
+                self._drain_task = asyncio.ensure_future(self._drain())
+            await asyncio.shield(self._drain_task)
+
+    async def close(self) -> None:
+        self._close_jsonl()
+        if self._phanes_tasks:
+            await asyncio.gather(*self._phanes_tasks, return_exceptions=True)
+        if not self._initialized:
             return
+        try:
+            await self.flush()
+        finally:
+            db, self._db = self._db, None
+            self._initialized = False
+            if db is not None:
+                await db.close()
+
+    async def record_signal(self, s: SignalEvent) -> None:
         if s.price_usd is not None and s.price_usd > 0:
             self._start_price_by_ca[s.ca] = s.price_usd
-        obj = asdict(s)
-        await asyncio.to_thread(self._append_jsonl, self.signals_path, obj)
-        await asyncio.to_thread(self._rotate_jsonl_if_needed, self.signals_path)
+        obj = _signal_to_dict(s)
+        self._append_jsonl(self.signals_path, obj)
         await self._insert_signal_db(s)
         # Forward to Phanes if configured (fire-and-forget)
-        if self._phanes_enabled:
-            try:
-                await phanes_forward_signal(obj)
-            except Exception:
-                pass
+        self._forward_phanes(phanes_forward_signal, obj)
 
     async def record_outcome(self, o: OutcomeEvent) -> None:
-        if not self.enabled:
+        await self.record_outcomes([o])
+
+    async def record_outcomes(self, outcomes: List[OutcomeEvent]) -> None:
+        """Record several outcomes with one JSONL write and one queued DB batch."""
+        if not outcomes:
             return
-        obj = asdict(o)
-        await asyncio.to_thread(self._append_jsonl, self.outcomes_path, obj)
-        await asyncio.to_thread(self._rotate_jsonl_if_needed, self.outcomes_path)
-        await self._insert_outcome_db(o)
-        if self._phanes_enabled:
+        objs = [_outcome_to_dict(o) for o in outcomes]
+        self._append_jsonl_bytes(self.outcomes_path, b"".join(json_dumps(obj) + b"\n" for obj in objs), len(objs))
+        await self._write_many([(_OUTCOME_INSERT_SQL, _outcome_row(o)) for o in outcomes])
+        for obj in objs:
+            self._forward_phanes(phanes_forward_outcome, obj)
+
+    def _forward_phanes(self, fn: Callable[[Dict[str, Any]], Awaitable[None]], obj: Dict[str, Any]) -> None:
+        task = asyncio.ensure_future(self._phanes_send(fn, obj))
+        self._phanes_tasks.add(task)
+        task.add_done_callback(self._phanes_tasks.discard)
+
+    async def _phanes_send(self, fn: Callable[[Dict[str, Any]], Awaitable[None]], obj: Dict[str, Any]) -> None:
+        if self._phanes_sem is None:
+            self._phanes_sem = asyncio.Semaphore(_PHANES_MAX_INFLIGHT)
+        async with self._phanes_sem:
             try:
-                await phanes_forward_outcome(obj)
+                await fn(obj)
             except Exception:
                 pass
 
     # ============ New helpers: mentions, coins, snapshots, holders, vip ============
     async def record_mention(self, ts_utc: str, ca: str, channel: str, message_id: Optional[str] = None) -> None:
-        if not self.enabled:
-            return
-        import aiosqlite
-        await self.init()
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                "INSERT OR IGNORE INTO mentions(ts_utc, ca, channel, message_id) VALUES(?, ?, ?, ?)",
-                (ts_utc, ca, channel, message_id),
-            )
-            await db.commit()
+        await self._write(_MENTION_INSERT_SQL, (ts_utc, ca, channel, message_id, _iso_to_ms(ts_utc)))
 
     async def upsert_coin(self, ca: str, symbol: Optional[str], pair_created_ms: Optional[int], seen_ts: str) -> None:
-        if not self.enabled:
-            return
-        import aiosqlite
-        await self.init()
-        async with aiosqlite.connect(self._db_path) as db:
-            # If not exists, create with first_seen_ts
-            await db.execute(
-                "INSERT OR IGNORE INTO coins(ca, first_seen_ts, last_seen_ts, symbol, pair_created_ms) VALUES(?, ?, ?, ?, ?)",
-                (ca, seen_ts, seen_ts, symbol, pair_created_ms or 0),
-            )
-            # Always update last_seen, and optionally symbol/pair_created_ms
-            await db.execute(
-                "UPDATE coins SET last_seen_ts = ?, symbol = COALESCE(?, symbol), pair_created_ms = CASE WHEN ? > 0 THEN ? ELSE pair_created_ms END WHERE ca = ?",
-                (seen_ts, symbol, int(pair_created_ms or 0), int(pair_created_ms or 0), ca),
-            )
-            await db.commit()
+        await self._write_many(_coin_rows(ca, symbol, pair_created_ms, seen_ts))
 
     async def record_snapshot(self, ca: str, metrics: Dict[str, Any], ts_utc: Optional[str] = None) -> None:
-        if not self.enabled:
+        ts, ts_ms = _ts_pair(ts_utc)
+        items = _coin_rows(ca, metrics.get('symbol'), metrics.get('pair_created_ms'), ts)
+        items.append((_SNAPSHOT_INSERT_SQL, _snapshot_row(ts, ts_ms, ca, metrics)))
+        await self._write_many(items)
+
+    async def record_snapshots_bulk(self, rows: List[Tuple[str, Dict[str, Any]]], ts_utc: Optional[str] = None) -> None:
+        """Queue a whole snapshot pass of (ca, metrics) pairs; the writer commits it as one batch."""
+        if not rows:
             return
-        import aiosqlite
-        from datetime import datetime, timezone
-        await self.init()
-        ts = ts_utc or datetime.now(timezone.utc).isoformat()
-        await self.upsert_coin(ca, metrics.get('symbol'), metrics.get('pair_created_ms'), ts)
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                """
-                INSERT OR IGNORE INTO snapshots(
-                    ts_utc, ca, price_usd, liquidity_usd, volume24_usd, volume1h_usd, market_cap_usd,
-                    txns_h1_total, buy_sell_ratio_h1, price_change_m5, price_change_m15, price_change_h1,
-                    pair_created_ms, trending
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    ts,
-                    ca,
-                    float(metrics.get('price_usd') or 0) if metrics.get('price_usd') is not None else None,
-                    float(metrics.get('liquidity_usd') or 0),
-                    float(metrics.get('volume24_usd') or 0),
-                    float(metrics.get('volume1h_usd') or 0),
-                    float(metrics.get('market_cap_usd') or 0),
-                    int(metrics.get('txns_h1_total') or 0),
-                    float(metrics.get('buy_sell_ratio_h1') or 0),
-                    float(metrics.get('price_change_m5') or 0),
-                    float(metrics.get('price_change_m15') or 0),
-                    float(metrics.get('price_change_h1') or 0),
-                    int(metrics.get('pair_created_ms') or 0),
-                    1 if metrics.get('trending') else 0,
-                ),
-            )
-            await db.commit()
+        ts, ts_ms = _ts_pair(ts_utc)
+        items: List[Tuple[str, Tuple[Any, ...]]] = []
+        items.extend((_COIN_INSERT_SQL, (ca, ts, ts, m.get('symbol'), m.get('pair_created_ms') or 0)) for ca, m in rows)
+        for ca, m in rows:
+            created = int(m.get('pair_created_ms') or 0)
+            items.append((_COIN_UPDATE_SQL, (ts, m.get('symbol'), created, created, ca)))
+        items.extend((_SNAPSHOT_INSERT_SQL, _snapshot_row(ts, ts_ms, ca, m)) for ca, m in rows)
+        await self._write_many(items)
 
     async def record_holders(self, ca: str, supply: float, largest_wallet_pct: float, approx_unique_holders: int, ts_utc: Optional[str] = None) -> None:
-        if not self.enabled:
-            return
-        import aiosqlite
-        from datetime import datetime, timezone
-        await self.init()
-        ts = ts_utc or datetime.now(timezone.utc).isoformat()
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                "INSERT OR REPLACE INTO holders(ts_utc, ca, supply, largest_wallet_pct, approx_unique_holders) VALUES(?, ?, ?, ?, ?)",
-                (ts, ca, float(supply or 0), float(largest_wallet_pct or 0), int(approx_unique_holders or 0)),
-            )
-            await db.commit()
+        ts, ts_ms = _ts_pair(ts_utc)
+        await self._write(
+            _HOLDERS_INSERT_SQL,
+            (ts, ca, float(supply or 0), float(largest_wallet_pct or 0), int(approx_unique_holders or 0), ts_ms),
+        )
 
     async def record_vip_holder(self, ca: str, wallet: str, ts_utc: Optional[str] = None) -> None:
-        if not self.enabled:
-            return
-        import aiosqlite
-        from datetime import datetime, timezone
-        await self.init()
-        ts = ts_utc or datetime.now(timezone.utc).isoformat()
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                "INSERT OR IGNORE INTO vip_holders(ts_utc, ca, wallet) VALUES(?, ?, ?)",
-                (ts, ca, wallet),
-            )
-            await db.commit()
+        ts = ts_utc or _utc_now_iso()
+        await self._write(_VIP_HOLDER_INSERT_SQL, (ts, ca, wallet))
 
     async def maybe_record_outcomes_from_snapshots(self, ca: str) -> None:
         """Compute horizon ROIs using first signal price vs future snapshots. Idempotent."""
-        if not self.enabled:
+        if ca in self._outcomes_complete:
             return
-        import aiosqlite
-        from datetime import datetime
         await self.init()
-        async with aiosqlite.connect(self._db_path) as db:
-            # Determine base signal timestamp and start price
-            cur = await db.execute("SELECT MIN(ts_utc) FROM signals WHERE ca = ?", (ca,))
-            row = await cur.fetchone()
-            base_ts = row[0] if row and row[0] else None
+        # Reads must see rows still waiting in the write queue
+        await self.flush()
+        db = self._db
+        # Determine base signal timestamp and start price
+        cur = await db.execute(_SIGNAL_FIRST_TS_SQL, (ca,))
+        row = await cur.fetchone()
+        base_ts = row[0] if row and row[0] else None
+        await cur.close()
+        base_ms = _iso_to_ms(base_ts) if base_ts else None
+        if base_ms is None:
+            return
+        start_price = self._start_price_by_ca.get(ca)
+        if not start_price:
+            # fallback to snapshot at or before base_ts
+            cur = await db.execute(_SNAPSHOT_PRICE_AT_SQL, (ca, base_ms))
+            r = await cur.fetchone()
             await cur.close()
-            if not base_ts:
+            if not r or r[0] is None or float(r[0]) <= 0:
                 return
-            start_price = self._start_price_by_ca.get(ca)
-            if not start_price:
-                # fallback to snapshot at or before base_ts
-                cur = await db.execute(
-                    "SELECT price_usd FROM snapshots WHERE ca = ? AND ts_utc <= ? ORDER BY ts_utc DESC LIMIT 1",
-                    (ca, base_ts),
-                )
-                r = await cur.fetchone()
-                await cur.close()
-                if not r or r[0] is None or float(r[0]) <= 0:
-                    return
-                start_price = float(r[0])
-            # For each horizon, if not recorded, find the nearest snapshot at or after target time
-            for minutes in self.roi_horizons_min:
-                cur = await db.execute(
-                    "SELECT COUNT(1) FROM outcomes WHERE ca = ? AND horizon_min = ? AND ts_utc >= ?",
-                    (ca, int(minutes), base_ts),
-                )
-                exists = (await cur.fetchone())[0] > 0
-                await cur.close()
-                if exists:
-                    continue
-                # find price after horizon
-                cur = await db.execute(
-                    "SELECT ts_utc, price_usd FROM snapshots WHERE ca = ? AND ts_utc >= datetime(?, '+' || ? || ' minutes') AND price_usd IS NOT NULL ORDER BY ts_utc ASC LIMIT 1",
-                    (ca, base_ts, int(minutes)),
-                )
-                snap = await cur.fetchone()
-                await cur.close()
-                if not snap:
-                    continue
-                end_price = float(snap[1] or 0)
-                if end_price <= 0:
-                    continue
-                roi_pct = (end_price - start_price) / start_price * 100.0
-                o = OutcomeEvent(ts_utc=snap[0], ca=ca, horizon_min=int(minutes), roi_pct=roi_pct,
-                                 price_start_usd=float(start_price), price_end_usd=end_price)
-                await self.record_outcome(o)
+            start_price = float(r[0])
+        # Horizons already recorded for this signal, in one query instead of one per horizon
+        cur = await db.execute(_OUTCOME_HORIZONS_SQL, (ca, base_ts))
+        recorded = {int(r[0]) for r in await cur.fetchall()}
+        await cur.close()
+        # For each horizon, if not recorded, find the nearest snapshot at or after target time
+        found: List[OutcomeEvent] = []
+        for minutes in self.roi_horizons_min:
+            if int(minutes) in recorded:
+                continue
+            cur = await db.execute(_SNAPSHOT_PRICE_AFTER_SQL, (ca, base_ms + int(minutes) * 60_000))
+            snap = await cur.fetchone()
+            await cur.close()
+            if not snap:
+                continue
+            end_price = float(snap[1] or 0)
+            if end_price <= 0:
+                continue
+            roi_pct = (end_price - start_price) / start_price * 100.0
+            found.append(OutcomeEvent(ts_utc=snap[0], ca=ca, horizon_min=int(minutes), roi_pct=roi_pct,
+                                      price_start_usd=float(start_price), price_end_usd=end_price))
+            recorded.add(int(minutes))
+        await self.record_outcomes(found)
+        if recorded.issuperset(int(m) for m in self.roi_horizons_min):
+            self._outcomes_complete.add(ca)
 
     def get_start_price(self, ca: str) -> Optional[float]:
         return self._start_price_by_ca.get(ca)
 
     def _append_jsonl(self, path: str, obj: Dict[str, Any]) -> None:
-        _ensure_dir(os.path.dirname(path) or ".")
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(obj, separators=(",", ":")) + "\n")
+        self._append_jsonl_bytes(path, json_dumps(obj) + b"\n", 1)
 
-    def _rotate_jsonl_if_needed(self, path: str) -> None:
-        try:
-            if not os.path.exists(path):
-                return
-            size = os.path.getsize(path)
-            if size < STATS_JSONL_MAX_BYTES:
-                return
-            # rotate old files: path.N -> path.(N+1)
-            for idx in range(STATS_MAX_JSONL_FILES - 1, 0, -1):
-                older = f"{path}.{idx}"
-                newer = f"{path}.{idx + 1}"
-                if os.path.exists(older):
-                    try:
-                        if idx + 1 >= STATS_MAX_JSONL_FILES and os.path.exists(newer):
-                            os.remove(newer)
-                        os.replace(older, newer)
-                    except Exception:
-                        continue
+    def _append_jsonl_bytes(self, path: str, data: bytes, lines: int) -> None:
+        fp = self._jsonl_fps.get(path)
+        if fp is None:
+            _ensure_dir(os.path.dirname(path) or ".")
+            fp = self._jsonl_fps[path] = open(path, "ab", buffering=_JSONL_BUFFER_BYTES)
+        fp.write(data)
+        self._jsonl_unflushed += lines
+        if self._jsonl_unflushed >= _JSONL_FLUSH_LINES:
+            self._flush_jsonl()
+        elif self._jsonl_flush_handle is None:
+            self._jsonl_flush_handle = asyncio.get_running_loop().call_later(_JSONL_FLUSH_SEC, self._flush_jsonl)
+        # Append-mode handles start at EOF, so tell() is the file size without a stat call
+        if fp.tell() >= STATS_JSONL_MAX_BYTES:
+            self._rotate_jsonl(path)
+
+    def _flush_jsonl(self) -> None:
+        if self._jsonl_flush_handle is not None:
+            self._jsonl_flush_handle.cancel()
+            self._jsonl_flush_handle = None
+        self._jsonl_unflushed = 0
+        for fp in self._jsonl_fps.values():
+            try:
+                fp.flush()
+            except Exception as e:
+                logger.warning("Stats JSONL flush failed: %s", e)
+
+    def _close_jsonl(self) -> None:
+        self._flush_jsonl()
+        fps, self._jsonl_fps = self._jsonl_fps, {}
+        for fp in fps.values():
             try:
-                os.replace(path, f"{path}.1")
+                fp.close()
             except Exception:
                 pass
-        except Exception:
-            pass
 
-    async def _insert_signal_db(self, s: SignalEvent) -> None:
-        if not self.enabled:
+    def _rotate_jsonl(self, path: str) -> None:
+        fp = self._jsonl_fps.pop(path, None)
+        if fp is not None:
+            try:
+                fp.close()
+            except Exception:
+                pass
+        # Rotated files form a ring of slots path.1..path.N; the full file moves into the next slot,
+        # replacing whatever oldest file was there, instead of shifting every older file down
+        slots = max(1, STATS_MAX_JSONL_FILES)
+        idx = self._rot_idx.get(path)
+        if idx is None:
+            idx = self._initial_rotation_slot(path, slots)
+        try:
+            os.replace(path, f"{path}.{idx}")
+        except Exception:
             return
-        import aiosqlite
-        await self.init()
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO signals (
-                    ts_utc, ca, symbol, classification, source_channels, uniques_overlap_min, mentions_total,
-                    liquidity_usd, volume24_usd, market_cap_usd, txns_h1_total, buy_sell_ratio_h1, price_change_m15, price_usd
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    s.ts_utc, s.ca, s.symbol, s.classification, json.dumps(s.source_channels, ensure_ascii=False),
-                    s.uniques_OverlapMin, s.mentions_total, s.liquidity_usd, s.volume24_usd, s.market_cap_usd,
-                    s.txns_h1_total, s.buy_sell_ratio_h1, s.price_change_m15, s.price_usd,
-                ),
-            )
-            await db.commit()
+        self._rot_idx[path] = idx % slots + 1
 
-    async def _insert_outcome_db(self, o: OutcomeEvent) -> None:
-        if not self.enabled:
-            return
-        import aiosqlite
-        await self.init()
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO outcomes (ts_utc, ca, horizon_min, roi_pct, price_start_usd, price_end_usd)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (o.ts_utc, o.ca, o.horizon_min, o.roi_pct, o.price_start_usd, o.price_end_usd),
-            )
-            await db.commit()
+    @staticmethod
+    def _initial_rotation_slot(path: str, slots: int) -> int:
+        # One scan per path per process: first free slot, else the least recently written one
+        oldest_idx, oldest_mtime = 1, None
+        for idx in range(1, slots + 1):
+            try:
+                mtime = os.path.getmtime(f"{path}.{idx}")
+            except OSError:
+                return idx
+            if oldest_mtime is None or mtime < oldest_mtime:
+                oldest_idx, oldest_mtime = idx, mtime
+        return oldest_idx
+
+    async def _insert_signal_db(self, s: SignalEvent) -> None:
+        await self._write(
+            _SIGNAL_INSERT_SQL,
+            (
+                s.ts_utc, s.ca, s.symbol, s.classification, json.dumps(s.source_channels, ensure_ascii=False),
+                s.uniques_OverlapMin, s.mentions_total, s.liquidity_usd, s.volume24_usd, s.market_cap_usd,
+                s.txns_h1_total, s.buy_sell_ratio_h1, s.price_change_m15, s.price_usd,
+            ),
+        )
 
     async def maybe_maintain_storage(self) -> None:
-        if not self.enabled:
-            return
-        import aiosqlite
         await self.init()
         try:
-            async with aiosqlite.connect(self._db_path) as db:
+            await self.flush()
+            db = self._db
+            lock = self._db_lock
+            assert lock is not None, "init() sets the DB lock"
+            async with lock:
                 try:
-                    for table in ("signals", "snapshots", "mentions", "holders", "outcomes"):
-                        await db.execute(
-                            f"DELETE FROM {table} WHERE ts_utc < datetime('now', ?)",
-                            (f"-{int(STATS_RETENTION_DAYS)} days",),
-                        )
+                    cutoff = (f"-{int(STATS_RETENTION_DAYS)} days",)
+                    for sql in _RETENTION_DELETE_SQL:
+                        await db.execute(sql, cutoff)
+                    cutoff_ms = (_utc_now_iso_ms()[1] - int(STATS_RETENTION_DAYS) * 86_400_000,)
+                    for sql in _RETENTION_DELETE_MS_SQL:
+                        await db.execute(sql, cutoff_ms)
                 except Exception:
                     pass
-                await db.execute("VACUUM")
+                # VACUUM cannot run inside the transaction the DELETEs opened
                 await db.commit()
+                await db.execute("VACUUM")
+                await db.execute("VACUUM snap")
         except Exception:
             pass
 
 
+class _NoopStatsRecorder(StatsRecorder):
+    """Stats disabled: every entry point returns immediately and nothing touches disk."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._initialized = False
+        self._start_price_by_ca: Dict[str, float] = {}
+
+    async def init(self) -> None:
+        return
+
+    async def flush(self) -> None:
+        return
+
+    async def close(self) -> None:
+        return
+
+    async def record_signal(self, s: SignalEvent) -> None:
+        return
+
+    async def record_outcome(self, o: OutcomeEvent) -> None:
+        return
+
+    async def record_outcomes(self, outcomes: List[OutcomeEvent]) -> None:
+        return
+
+    async def record_mention(self, ts_utc: str, ca: str, channel: str, message_id: Optional[str] = None) -> None:
+        return
+
+    async def upsert_coin(self, ca: str, symbol: Optional[str], pair_created_ms: Optional[int], seen_ts: str) -> None:
+        return
+
+    async def record_snapshot(self, ca: str, metrics: Dict[str, Any], ts_utc: Optional[str] = None) -> None:
+        return
+
+    async def record_snapshots_bulk(self, rows: List[Tuple[str, Dict[str, Any]]], ts_utc: Optional[str] = None) -> None:
+        return
+
+    async def record_holders(self, ca: str, supply: float, largest_wallet_pct: float, approx_unique_holders: int, ts_utc: Optional[str] = None) -> None:
+        return
+
+    async def record_vip_holder(self, ca: str, wallet: str, ts_utc: Optional[str] = None) -> None:
+        return
+
+    async def maybe_record_outcomes_from_snapshots(self, ca: str) -> None:
+        return
+
+    async def maybe_maintain_storage(self) -> None:
+        return
+
+
 async def evaluate_roi_for_ca(ca: str, minutes: int, fetch_price_fn) -> Optional[OutcomeEvent]:
     try:
         start_price = await fetch_price_fn(ca, at_start=True)
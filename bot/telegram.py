@@ -1,17 +1,18 @@
 import logging
 import asyncio
+import heapq
+import operator
 import re
-from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Set
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, Set
 from collections import OrderedDict
+from functools import lru_cache
 
 from telethon import TelegramClient, events
 from telethon.errors import FloodWaitError, RPCError
-from telethon.tl.types import (
-    MessageEntityCode,
-    MessageEntityPre,
-    MessageEntityTextUrl,
-)
+from telethon.tl.types import MessageEntityTextUrl
 
 from config.config import (
     API_ID,
@@ -34,6 +35,9 @@ from config.config import (
     HEALTH_LOG_SECONDS,
     SOLANA_CACHE_CAPACITY,
     VALIDATIONS_PER_MESSAGE_LIMIT,
+    TELEGRAM_SEND_RATE_PER_SEC,
+    TELEGRAM_SEND_QUEUE_MAX,
+    TELEGRAM_HANDLER_CONCURRENCY,
 )
 from bot.evaluator import Evaluator
 from bot.utils import read_json, write_json_atomic
@@ -43,6 +47,82 @@ from bot.apis import solana_get_account_info
 
 logger = logging.getLogger(__name__)
 
+# Compiled once and bound, so per-message calls skip the re module's pattern-cache lookup
+_BASE58_FULLMATCH = re.compile(r"[1-9A-HJ-NP-Za-km-z]+").fullmatch
+# One translate pass for normalization: drop zero-width chars, straighten curly quotes and dashes,
+# and turn exotic spaces into plain ones
+_NORMALIZE_TABLE = {
+    **dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff")),
+    **{ord(c): '"' for c in "\u201c\u201d"},
+    **{ord(c): "'" for c in "\u2018\u2019"},
+    **{ord(c): "-" for c in "\u2013\u2014"},
+    **{ord(c): " " for c in "\u00a0\u202f\u205f\u3000"},
+    **{cp: " " for cp in range(0x2000, 0x200B)},
+}
+_WHITESPACE_RUN_SUB = re.compile(r"\s+").sub
+
+# Every CA pattern needs a run of 16+ base58 chars once formatting marks and whitespace are dropped,
+# so one linear scan for such a run rules out most chat messages before the pattern passes below
+_CA_CANDIDATE_SEARCH = re.compile(r"[1-9A-HJ-NP-Za-km-z]{16}").search
+_CA_PROBE_STRIP = str.maketrans("", "", "`*_~ \t\r\n\f\v")
+# ...and at least 32 of them in total, so shorter texts can skip the translate and the scan entirely
+_MIN_CA_TEXT_LEN = 32
+
+
+# coin_counts guardrail: once above _COIN_COUNTS_MAX entries, keep only the _COIN_COUNTS_KEEP hottest
+_COIN_COUNTS_MAX = 5000
+_COIN_COUNTS_KEEP = 1000
+_BY_COUNT = operator.itemgetter(1)
+_COOLDOWN_T1_SECONDS = COOLDOWN_MINUTES_T1 * 60.0
+# Chats whose (title, username) stay cached; only matters when monitoring every chat
+_CHAT_META_MAX = 1000
+# Evaluator memory is pruned once per this many processed mentions
+_PRUNE_EVERY_MENTIONS = 25
+# Per-CA alert state (tiers and T1 cooldowns) is LRU-capped; the oldest-touched CAs are long stale
+_TIER_STATE_MAX = 20_000
+
+
+_LINKS_TPL = (
+    "Links: DexScreener https://dexscreener.com/solana/{ca}"
+    " | Birdeye https://birdeye.so/token/{ca}?chain=solana"
+    " | Jupiter https://jup.ag/swap/SOL-{ca}"
+)
+_ALERT_TPL = "{hp} [{tl}]\nCA: {ca} ({short})\nSource: {gn}\n{links}"
+# CAs can alert again hours apart (T1 -> T3, evaluator re-ranks), so keep a few thousand of them
+_CA_TEXT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_CA_TEXT_CACHE_SIZE)
+def _links_line(ca: str) -> str:
+    # Popular CAs alert repeatedly; the line only depends on the CA, so reuse it
+    return _LINKS_TPL.format(ca=ca)
+
+
+@lru_cache(maxsize=_CA_TEXT_CACHE_SIZE)
+def _ca_presentation(ca: str) -> tuple[str, str]:
+    # (short form, links line) for alerts; a CA climbing T1 -> T2 -> T3 reuses both
+    return ca[:4] + "..." + ca[-4:], _links_line(ca)
+
+
+def _has_ca_candidate(text: str) -> bool:
+    return len(text) >= _MIN_CA_TEXT_LEN and _CA_CANDIDATE_SEARCH(text.translate(_CA_PROBE_STRIP)) is not None
+
+
+# Each CA pattern keeps its own findall: an alternation would let one pattern's match consume text another
+# pattern matches differently (e.g. "Contract<addr>" is both a bare base58 run and a prefixed address)
+_CA_FINDALLS = tuple(p.findall for p in CA_PATTERNS)
+
+
+def _collect(text: str, out: Set[str]) -> None:
+    # findall yields strings for single-group patterns and tuples for the split-address pattern
+    add = out.add
+    for findall in _CA_FINDALLS:
+        for match in findall(text):
+            if isinstance(match, tuple):
+                out.update(g for g in match if g)
+            else:
+                add(match)
+
 
 def extract_contract_addresses_from_message(event: events.NewMessage.Event) -> Set[str]:
     """
@@ -64,141 +144,60 @@ def extract_contract_addresses_from_message(event: events.NewMessage.Event) -> S
     all_texts = [raw_text, message_text]
     if raw_text != message_text:
         all_texts.append(raw_text + " " + message_text)
+
+    # Entity text is a slice of raw_text, so only URL entities can add a candidate the texts lack
+    entities = getattr(message, 'entities', None) or ()
+    # Probe each text once; the pattern, variant and split passes below only run over texts that pass
+    candidate_texts = [t for t in all_texts if _has_ca_candidate(t)]
+    if not candidate_texts and not any(
+        _has_ca_candidate(getattr(entity, 'url', None) or "") for entity in entities
+    ):
+        return contract_addresses
     
     # Extract using all patterns from all text sources
-    for text in all_texts:
-        if not text:
-            continue
-            
-        # Apply all regex patterns
-        for pattern in CA_PATTERNS:
-            try:
-                matches = pattern.findall(text)
-                if isinstance(matches, list):
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            # Handle patterns that return multiple groups
-                            for group in match:
-                                if group and isinstance(group, str):
-                                    contract_addresses.add(group)
-                        elif isinstance(match, str):
-                            contract_addresses.add(match)
-            except Exception as e:
-                logger.debug(f"Error applying pattern {pattern.pattern}: {e}")
-                continue
+    for text in candidate_texts:
+        _collect(text, contract_addresses)
     
-    # Extract from message entities
-    if hasattr(message, 'entities') and message.entities:
-        for entity in message.entities:
-            try:
-                # Handle code blocks (```code```)
-                if isinstance(entity, MessageEntityCode):
-                    start = entity.offset
-                    length = entity.length
-                    if start + length <= len(raw_text):
-                        code_text = raw_text[start:start + length]
-                        for pattern in CA_PATTERNS:
-                            matches = pattern.findall(code_text)
-                            if isinstance(matches, list):
-                                for match in matches:
-                                    if isinstance(match, tuple):
-                                        for group in match:
-                                            if group and isinstance(group, str):
-                                                contract_addresses.add(group)
-                                    elif isinstance(match, str):
-                                        contract_addresses.add(match)
-                
-                # Handle pre-formatted text (```language\ncode```)
-                elif isinstance(entity, MessageEntityPre):
-                    start = entity.offset
-                    length = entity.length
-                    if start + length <= len(raw_text):
-                        pre_text = raw_text[start:start + length]
-                        for pattern in CA_PATTERNS:
-                            matches = pattern.findall(pre_text)
-                            if isinstance(matches, list):
-                                for match in matches:
-                                    if isinstance(match, tuple):
-                                        for group in match:
-                                            if group and isinstance(group, str):
-                                                contract_addresses.add(group)
-                                    elif isinstance(match, str):
-                                        contract_addresses.add(match)
-                
-                # Handle text URLs (might contain contract addresses)
-                elif isinstance(entity, MessageEntityTextUrl):
-                    if entity.url:
-                        # Check if URL contains a contract address
-                        for pattern in CA_PATTERNS:
-                            url_matches = pattern.findall(entity.url)
-                            if isinstance(url_matches, list):
-                                for match in url_matches:
-                                    if isinstance(match, tuple):
-                                        for group in match:
-                                            if group and isinstance(group, str):
-                                                contract_addresses.add(group)
-                                    elif isinstance(match, str):
-                                        contract_addresses.add(match)
-                    
-                    # Also check the text part of the URL entity
-                    start = entity.offset
-                    length = entity.length
-                    if start + length <= len(raw_text):
-                        url_text = raw_text[start:start + length]
-                        for pattern in CA_PATTERNS:
-                            matches = pattern.findall(url_text)
-                            if isinstance(matches, list):
-                                for match in matches:
-                                    if isinstance(match, tuple):
-                                        for group in match:
-                                            if group and isinstance(group, str):
-                                                contract_addresses.add(group)
-                                    elif isinstance(match, str):
-                                        contract_addresses.add(match)
-                
-                # Handle other text entities (mentions, hashtags, etc.)
-                elif hasattr(entity, 'offset') and hasattr(entity, 'length'):
-                    start = entity.offset
-                    length = entity.length
-                    if start + length <= len(raw_text):
-                        entity_text = raw_text[start:start + length]
-                        for pattern in CA_PATTERNS:
-                            matches = pattern.findall(entity_text)
-                            if isinstance(matches, list):
-                                for match in matches:
-                                    if isinstance(match, tuple):
-                                        for group in match:
-                                            if group and isinstance(group, str):
-                                                contract_addresses.add(group)
-                                    elif isinstance(match, str):
-                                        contract_addresses.add(match)
-                        
-            except Exception as e:
-                logger.debug(f"Error processing entity {type(entity).__name__}: {e}")
-                continue
+    # Extract from message entities: code, pre, text-URL and any other entity all cover a slice of raw_text,
+    # and text-URL entities carry a URL of their own that may hold the address
+    for entity in entities:
+        try:
+            if isinstance(entity, MessageEntityTextUrl) and entity.url and _has_ca_candidate(entity.url):
+                _collect(entity.url, contract_addresses)
+            start = getattr(entity, 'offset', None)
+            length = getattr(entity, 'length', None)
+            if start is not None and length is not None and start + length <= len(raw_text):
+                entity_text = raw_text[start:start + length]
+                if _has_ca_candidate(entity_text):
+                    _collect(entity_text, contract_addresses)
+        except Exception as e:
+            logger.debug("Error processing entity %s: %s", type(entity).__name__, e)
+            continue
     
     # Extract from additional formats
-    for text in all_texts:
+    for text in candidate_texts:
         additional_addresses = extract_from_additional_formats(text)
         contract_addresses.update(additional_addresses)
     
     # Handle split addresses (addresses broken across lines or spaces)
-    for text in all_texts:
-        if not text:
-            continue
-        # Look for potential split addresses
+    for text in candidate_texts:
+        # Look for potential split addresses: adjacent all-base58 words whose lengths sum to 32-44.
+        # Each word is measured and checked once, so only qualifying pairs are concatenated
         words = text.split()
+        lens = [len(w) for w in words]
+        is_b58 = [n <= 43 and _BASE58_FULLMATCH(w) is not None for n, w in zip(lens, words)]
         for i in range(len(words) - 1):
-            combined = words[i] + words[i + 1]
-            if 32 <= len(combined) <= 44 and re.match(r'^[1-9A-HJ-NP-Za-km-z]+$', combined):
-                contract_addresses.add(combined)
+            if is_b58[i] and is_b58[i + 1] and 32 <= lens[i] + lens[i + 1] <= 44:
+                contract_addresses.add(words[i] + words[i + 1])
     
     # Clean and validate contract addresses
     validated_addresses: Set[str] = set()
     for ca in contract_addresses:
         # Basic validation: should be 32-44 characters, Base58
-        if 32 <= len(ca) <= 44 and re.match(r'^[1-9A-HJ-NP-Za-km-z]+$', ca):
-            validated_addresses.add(ca)
+        if 32 <= len(ca) <= 44 and _BASE58_FULLMATCH(ca):
+            # Interned so every dict keyed by this CA (counts, tiers, cooldowns, evaluator) shares one
+            # string object and lookups can match on identity
+            validated_addresses.add(sys.intern(ca))
     
     return validated_addresses
 
@@ -212,8 +211,9 @@ def extract_from_additional_formats(text: str) -> Set[str]:
     if not text:
         return addresses
     
-    # Handle common formatting variations
-    text_variants = [
+    # Handle common formatting variations; most replaces are no-ops on a given message, so the set
+    # leaves one scan per distinct variant
+    text_variants = {
         text,
         text.replace('\n', ' '),
         text.replace('\r', ' '),
@@ -223,22 +223,10 @@ def extract_from_additional_formats(text: str) -> Set[str]:
         text.replace('*', ''),     # Remove asterisks
         text.replace('_', ''),     # Remove underscores
         text.replace('~', ''),     # Remove tildes
-    ]
+    }
     
     for variant in text_variants:
-        for pattern in CA_PATTERNS:
-            try:
-                matches = pattern.findall(variant)
-                if isinstance(matches, list):
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            for group in match:
-                                if group and isinstance(group, str):
-                                    addresses.add(group)
-                        elif isinstance(match, str):
-                            addresses.add(match)
-            except Exception:
-                continue
+        _collect(variant, addresses)
     
     return addresses
 
@@ -251,25 +239,11 @@ def normalize_text_for_extraction(text: str) -> str:
     if not text:
         return ""
     
-    # Remove common formatting characters that might interfere
-    normalized = text
-    
-    # Handle zero-width characters
-    normalized = re.sub(r'[\u200b-\u200d\ufeff]', '', normalized)
-    
-    # Handle various quote types
-    # Standardize curly quotes to straight quotes
-    normalized = normalized.replace('“', '"').replace('”', '"')
-    normalized = normalized.replace('’', "'").replace('‘', "'")
-    
-    # Handle various dash types
-    normalized = normalized.replace('–', '-').replace('—', '-')
-    
-    # Handle various space types
-    normalized = re.sub(r'[\u00a0\u2000-\u200a\u202f\u205f\u3000]', ' ', normalized)
+    # Zero-width characters, curly quotes, dashes and space variants in a single pass
+    normalized = text.translate(_NORMALIZE_TABLE)
     
     # Normalize multiple spaces
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = _WHITESPACE_RUN_SUB(' ', normalized)
     
     return normalized.strip()
 
@@ -280,13 +254,33 @@ class Bot:
         self.evaluator: Optional[Evaluator] = None
         self.stats: Optional[StatsRecorder] = StatsRecorder()
         self.coin_counts: dict[str, int] = {}
-        self.coin_tier_state: dict[str, int] = {}
-        self.last_t1_sent_utc: dict[str, datetime] = {}
-        self.last_reset_utc = datetime.now(timezone.utc)
-        self._bg_tasks: set[asyncio.Task] = set()
+        # LRU order (oldest first); updated through _touch_tier, capped at _TIER_STATE_MAX
+        self.coin_tier_state: "OrderedDict[str, int]" = OrderedDict()
+        # Epoch seconds (time.time()); same LRU order and cap as coin_tier_state
+        self.last_t1_sent_utc: "OrderedDict[str, float]" = OrderedDict()
+        # ISO form of last_t1_sent_utc, kept in step with it so saves don't reformat every entry
+        self._last_t1_iso: "OrderedDict[str, str]" = OrderedDict()
+        self.last_reset_utc = time.time()
+        # Set when coin_tier_state/last_t1_sent_utc change; see _state_saver_loop
+        self._state_dirty = False
+        self._bg_tasks: "set[asyncio.Task[None]]" = set()
         self._stop_event = asyncio.Event()
         self._solana_check_cache: "OrderedDict[str, bool]" = OrderedDict()
         self._solana_cache_capacity = max(1000, int(SOLANA_CACHE_CAPACITY))
+        # Outgoing alerts go through a paced queue so handlers never wait on Telegram; created in start()
+        self._send_q: Optional["asyncio.Queue[tuple[str, Optional[Callable[[], Awaitable[None]]]]]"] = None
+        # chat_id -> (title, username); group metadata doesn't change while we run
+        self._chat_meta: "OrderedDict[int, tuple[str, Optional[str]]]" = OrderedDict()
+        # Evaluator mentions processed since its memory was last pruned
+        self._mentions_since_prune = 0
+        # Per-CA alert path, fixed by config; re-resolved in start() once the evaluator exists
+        self._route: Callable[[str, str, int, str, float], Awaitable[None]] = self._resolve_route()
+        # Messages run as tasks so a slow chat can't stall the others; the per-chat lock keeps each
+        # chat in arrival order and the gate bounds total in-flight handlers. Gate is created in start()
+        # chat_id -> [lock, tasks holding or waiting on it]; dropped when the count reaches zero so
+        # the map only covers chats with messages in flight
+        self._chat_locks: dict[int, list] = {}
+        self._gate: Optional[asyncio.Semaphore] = None
 
     async def _is_solana_mint(self, ca: str) -> bool:
         # LRU cache lookup
@@ -309,53 +303,107 @@ class Bot:
     async def start(self) -> None:
         await self.client.start()
         self.evaluator = Evaluator(self._send_evaluator_message)
+        self._route = self._resolve_route()
+        if self.stats:
+            # One recorder (and so one DB connection and write queue) for the whole bot
+            self.evaluator.stats = self.stats
         await self._load_state()
-        self.client.add_event_handler(self._on_message, events.NewMessage(chats=MONITORED_GROUPS if MONITORED_GROUPS else None))
+        self._gate = asyncio.Semaphore(max(1, TELEGRAM_HANDLER_CONCURRENCY))
+        self.client.add_event_handler(self._on_event, events.NewMessage(chats=MONITORED_GROUPS if MONITORED_GROUPS else None))
         logger.info("Client started. Monitoring groups... Press Ctrl+C to stop.")
-        self._bg_tasks.add(asyncio.create_task(self._state_saver_loop()))
-        self._bg_tasks.add(asyncio.create_task(self._health_loop()))
+        self._send_q = asyncio.Queue(maxsize=max(1, TELEGRAM_SEND_QUEUE_MAX))
+        self._spawn(self._state_saver_loop())
+        self._spawn(self._health_loop())
+        self._spawn(self._sender_loop())
 
     async def stop(self) -> None:
         self._stop_event.set()
-        for t in list(self._bg_tasks):
+        if self._send_q is not None:
+            # Give queued alerts a moment to go out before the sender is cancelled
+            try:
+                await asyncio.wait_for(self._send_q.join(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("Dropping %d queued alert(s) on shutdown", self._send_q.qsize())
+        tasks = list(self._bg_tasks)
+        for t in tasks:
             t.cancel()
         try:
-            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+            await asyncio.gather(*tasks, return_exceptions=True)
         finally:
             self._bg_tasks.clear()
-        await self._save_state()
+        if self._state_is_dirty():
+            await self._save_state()
+        if self.stats:
+            try:
+                await self.stats.close()
+            except Exception as e:
+                logger.warning("Failed to close stats DB: %s", e)
         await self.client.disconnect()
 
-    def _maybe_reset_counts(self) -> None:
+    def _maybe_reset_counts(self, now_ts: Optional[float] = None) -> None:
         if HOT_RESET_HOURS <= 0:
             return
-        if datetime.now(timezone.utc) - self.last_reset_utc >= timedelta(hours=HOT_RESET_HOURS):
+        if now_ts is None:
+            now_ts = time.time()
+        if now_ts - self.last_reset_utc >= HOT_RESET_HOURS * 3600.0:
             self.coin_counts = {}
-            self.last_reset_utc = datetime.now(timezone.utc)
+            self.last_reset_utc = now_ts
             logger.info("Hot counts reset due to window elapsed")
         # Guardrail: cap coin_counts size to avoid unbounded memory
-        max_entries = 5000
-        if len(self.coin_counts) > max_entries:
-            # keep top-N by count
-            top = sorted(self.coin_counts.items(), key=lambda kv: kv[1], reverse=True)[:1000]
-            self.coin_counts = {k: v for k, v in top}
+        if len(self.coin_counts) > _COIN_COUNTS_MAX:
+            # keep top-N by count; a bounded heap avoids sorting every entry
+            self.coin_counts = dict(heapq.nlargest(_COIN_COUNTS_KEEP, self.coin_counts.items(), key=_BY_COUNT))
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> "asyncio.Task[None]":
+        # The loop only holds weak references to tasks, so keep a strong one until the task finishes
+        task: "asyncio.Task[None]" = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    async def _on_event(self, event: events.NewMessage.Event) -> None:
+        self._spawn(self._dispatch(event))
+
+    async def _dispatch(self, event: events.NewMessage.Event) -> None:
+        if self._gate is None:
+            self._gate = asyncio.Semaphore(max(1, TELEGRAM_HANDLER_CONCURRENCY))
+        chat_id: Optional[int] = getattr(event, "chat_id", None)
+        if chat_id is None:
+            # No chat to order within; don't let id-less events share one lock
+            async with self._gate:
+                await self._on_message(event)
+            return
+        # Chat lock first: tasks for one chat queue on it in creation order, before competing for the gate
+        entry = self._chat_locks.get(chat_id)
+        if entry is None:
+            entry = self._chat_locks[chat_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                async with self._gate:
+                    await self._on_message(event)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._chat_locks[chat_id]
 
     async def _on_message(self, event: events.NewMessage.Event) -> None:
         try:
             messages_processed_total.inc()
-            self._maybe_reset_counts()
+            # One clock read per message, shared by the reset check, cooldowns and analytics timestamps
+            now_ts = time.time()
+            self._maybe_reset_counts(now_ts)
             if getattr(event, "is_reply", False) or getattr(event, "fwd_from", None):
                 return
-            sender = await event.get_chat()
-            group_name = getattr(sender, "title", "Unknown Group")
-            username = getattr(sender, "username", None)
-            channel_key = ("@" + username) if username else group_name
-
-            # Extract contract addresses using enhanced method
+            # Extract contract addresses using enhanced method; most messages have none, so this runs
+            # before any await
             contract_addresses = extract_contract_addresses_from_message(event)
             
             if not contract_addresses:
                 return
+
+            group_name, username = await self._chat_title_and_username(event)
+            channel_key = ("@" + username) if username else group_name
             
             # Process each detected contract address with Solana-only enforcement
             cached_true: List[str] = []
@@ -383,34 +431,26 @@ class Bot:
                     if is_sol:
                         cached_true.append(ca)
                     else:
-                        logger.debug(f"Ignoring non-Solana CA {ca} in {group_name}")
+                        logger.debug("Ignoring non-Solana CA %s in %s", ca, group_name)
 
+            now_iso = datetime.fromtimestamp(now_ts, timezone.utc).isoformat() if cached_true else ""
             for ca in cached_true:
                 new_count = self.coin_counts.get(ca, 0) + 1
                 self.coin_counts[ca] = new_count
-                logger.info(f"Detected CA {ca} in {group_name} (Count: {new_count})")
+                logger.info("Detected CA %s in %s (Count: %d)", ca, group_name, new_count)
                 # Record mention row for analytics
                 try:
                     if self.stats:
-                        await self.stats.record_mention(datetime.now(timezone.utc).isoformat(), ca, channel_key, str(getattr(event.message, 'id', '')))
+                        await self.stats.record_mention(now_iso, ca, channel_key, str(getattr(event.message, 'id', '')))
                 except Exception:
                     pass
 
-                if ENABLE_EVALUATOR and self.evaluator:
-                    await self.evaluator.process_mention(ca, channel_key)
-                    # prune periodically to avoid growth
-                    if self.evaluator and (len(self.evaluator.state.mentions_by_ca) % 25 == 0):
-                        self.evaluator.prune_memory()
-                elif ENABLE_TIERED_ALERTS:
-                    await self._maybe_send_tiered_alert(ca, group_name, new_count)
-                else:
-                    if new_count == HOT_THRESHOLD:
-                        await self._send_alert_message(ca, tier_label=f"T3 x{HOT_THRESHOLD}", header_prefix=">>> ALERT", group_name=group_name)
+                await self._route(ca, group_name, new_count, channel_key, now_ts)
                 # Record a RAW detection event for analytics
                 try:
                     if self.stats:
                         ev = SignalEvent(
-                            ts_utc=datetime.now(timezone.utc).isoformat(),
+                            ts_utc=now_iso,
                             ca=ca,
                             symbol=None,
                             classification="RAW",
@@ -431,93 +471,180 @@ class Bot:
                         
         except Exception as e:
             errors_total.labels("telegram_handler").inc()
-            logger.exception(f"Handler error: {e}")
+            logger.exception("Handler error: %s", e)
 
-    async def _send_evaluator_message(self, ca: str, classification: str, body: str) -> None:
+    def _resolve_route(self) -> Callable[[str, str, int, str, float], Awaitable[None]]:
+        if ENABLE_EVALUATOR and self.evaluator:
+            return self._route_evaluator
+        if ENABLE_TIERED_ALERTS:
+            return self._route_tiered
+        return self._route_hot
+
+    async def _route_evaluator(self, ca: str, group_name: str, count: int, channel_key: str, now_ts: float) -> None:
+        evaluator = self.evaluator
+        assert evaluator is not None, "_resolve_route only picks this route with an evaluator"
+        await evaluator.process_mention(ca, channel_key)
+        # prune periodically to avoid growth
+        self._mentions_since_prune += 1
+        if self._mentions_since_prune >= _PRUNE_EVERY_MENTIONS:
+            self._mentions_since_prune = 0
+            evaluator.prune_memory()
+
+    async def _route_tiered(self, ca: str, group_name: str, count: int, channel_key: str, now_ts: float) -> None:
+        await self._maybe_send_tiered_alert(ca, group_name, count, now_ts)
+
+    async def _route_hot(self, ca: str, group_name: str, count: int, channel_key: str, now_ts: float) -> None:
+        if count == HOT_THRESHOLD:
+            await self._send_alert_message(ca, tier_label=f"T3 x{HOT_THRESHOLD}", header_prefix=">>> ALERT", group_name=group_name)
+
+    async def _chat_title_and_username(self, event: events.NewMessage.Event) -> tuple[str, Optional[str]]:
+        cid: Optional[int] = getattr(event, "chat_id", None)
+        if cid is None:
+            # Nothing to key the cache on
+            return await self._fetch_chat_meta(event)
+        meta = self._chat_meta.get(cid)
+        if meta is not None:
+            self._chat_meta.move_to_end(cid)
+            return meta
+        meta = self._chat_meta[cid] = await self._fetch_chat_meta(event)
+        if len(self._chat_meta) > _CHAT_META_MAX:
+            self._chat_meta.popitem(last=False)
+        return meta
+
+    @staticmethod
+    async def _fetch_chat_meta(event: events.NewMessage.Event) -> tuple[str, Optional[str]]:
+        sender = await event.get_chat()
+        return getattr(sender, "title", "Unknown Group"), getattr(sender, "username", None)
+
+    async def _enqueue_send(self, text: str, on_sent: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        if self._send_q is None:
+            # Not started (e.g. direct use in tests): deliver inline
+            await self._deliver(text, on_sent)
+            return
         try:
-            links = self._build_links_line(ca)
-            await self.client.send_message(TARGET_GROUP, body + "\n" + links, link_preview=False)
-            # Record structured signal for analytics
+            self._send_q.put_nowait((text, on_sent))
+        except asyncio.QueueFull:
+            errors_total.labels("telegram_send_queue").inc()
+            logger.warning("Alert send queue full; dropping alert")
+
+    async def _sender_loop(self) -> None:
+        q = self._send_q
+        assert q is not None, "sender loop started before the send queue"
+        interval = 1.0 / TELEGRAM_SEND_RATE_PER_SEC if TELEGRAM_SEND_RATE_PER_SEC > 0 else 0.0
+        while True:
+            text, on_sent = await q.get()
             try:
-                if self.stats and self.evaluator:
-                    st = self.evaluator.state
-                    dex = st.dex_cache.get(ca) or {}
-                    mentions = st.mentions_by_ca.get(ca, [])
-                    channels = list({m.channel for m in mentions})[:5]
-                    ev = SignalEvent(
-                        ts_utc=datetime.now(timezone.utc).isoformat(),
-                        ca=ca,
-                        symbol=dex.get('symbol'),
-                        classification=classification,
-                        source_channels=channels,
-                        uniques_OverlapMin=0,
-                        mentions_total=len(mentions),
-                        liquidity_usd=float(dex.get('liquidity_usd') or 0.0),
-                        volume24_usd=float(dex.get('volume24_usd') or 0.0),
-                        market_cap_usd=float(dex.get('market_cap_usd') or 0.0),
-                        txns_h1_total=int(dex.get('txns_h1_total') or 0),
-                        buy_sell_ratio_h1=float(dex.get('buy_sell_ratio_h1') or 0.0),
-                        price_change_m15=float(dex.get('price_change_m15') or 0.0),
-                        price_usd=(float(dex.get('price_usd')) if dex.get('price_usd') else None),
-                    )
-                    await self.stats.record_signal(ev)
-            except Exception:
-                pass
-        except FloodWaitError as e:
-            logger.warning(f"Flood wait {e.seconds}s on alert send; delaying...")
-            await asyncio.sleep(e.seconds)
-        except RPCError as e:
-            logger.error(f"Telegram RPC error while sending alert: {e}")
-
-    def _build_links_line(self, ca: str) -> str:
-        ds = f"https://dexscreener.com/solana/{ca}"
-        be = f"https://birdeye.so/token/{ca}?chain=solana"
-        jup = f"https://jup.ag/swap/SOL-{ca}"
-        return f"Links: DexScreener {ds} | Birdeye {be} | Jupiter {jup}"
+                await self._deliver(text, on_sent)
+            except Exception as e:
+                logger.error("Alert delivery failed: %s", e)
+            finally:
+                q.task_done()
+            if interval:
+                await asyncio.sleep(interval)
 
-    async def _send_alert_message(self, ca: str, tier_label: str, header_prefix: str, group_name: str) -> None:
-        short = f"{ca[:4]}...{ca[-4:]}"
-        links = self._build_links_line(ca)
-        msg = (
-            f"{header_prefix} [{tier_label}]\n"
-            f"CA: {ca} ({short})\n"
-            f"Source: {group_name}\n"
-            f"{links}"
-        )
+    async def _deliver(self, text: str, on_sent: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        for _attempt in range(2):
+            try:
+                await self.client.send_message(TARGET_GROUP, text, link_preview=False)
+            except FloodWaitError as e:
+                logger.warning("Flood wait %ss on alert send; delaying...", e.seconds)
+                await asyncio.sleep(e.seconds)
+                continue
+            except RPCError as e:
+                logger.error("Telegram RPC error while sending alert: %s", e)
+                return
+            if on_sent is not None:
+                await on_sent()
+            return
+
+    async def _send_evaluator_message(self, ca: str, classification: str, body: str) -> None:
+        async def _on_sent() -> None:
+            await self._record_evaluator_signal(ca, classification)
+
+        await self._enqueue_send(body + "\n" + _links_line(ca), _on_sent)
+
+    async def _record_evaluator_signal(self, ca: str, classification: str) -> None:
+        # Record structured signal for analytics
         try:
-            await self.client.send_message(TARGET_GROUP, msg, link_preview=False)
-            logger.info(f"Alert sent [{tier_label}] for {ca}")
+            if self.stats and self.evaluator:
+                st = self.evaluator.state
+                dex = st.dex_cache.get(ca) or {}
+                mentions = st.mentions_by_ca.get(ca, ())
+                channels = list({m.channel for m in mentions})[:5]
+                ev = SignalEvent(
+                    ts_utc=datetime.now(timezone.utc).isoformat(),
+                    ca=ca,
+                    symbol=dex.get('symbol'),
+                    classification=classification,
+                    source_channels=channels,
+                    uniques_OverlapMin=0,
+                    mentions_total=len(mentions),
+                    liquidity_usd=float(dex.get('liquidity_usd') or 0.0),
+                    volume24_usd=float(dex.get('volume24_usd') or 0.0),
+                    market_cap_usd=float(dex.get('market_cap_usd') or 0.0),
+                    txns_h1_total=int(dex.get('txns_h1_total') or 0),
+                    buy_sell_ratio_h1=float(dex.get('buy_sell_ratio_h1') or 0.0),
+                    price_change_m15=float(dex.get('price_change_m15') or 0.0),
+                    price_usd=(float(dex.get('price_usd')) if dex.get('price_usd') else None),
+                )
+                await self.stats.record_signal(ev)
+        except Exception:
+            pass
+
+    async def _send_alert_message(self, ca: str, tier_label: str, header_prefix: str, group_name: str) -> None:
+        short, links = _ca_presentation(ca)
+        msg = _ALERT_TPL.format(hp=header_prefix, tl=tier_label, ca=ca, short=short, gn=group_name, links=links)
+
+        async def _on_sent() -> None:
+            logger.info("Alert sent [%s] for %s", tier_label, ca)
             try:
                 alerts_sent_total.labels(tier_label).inc()
             except Exception:
                 pass
-        except FloodWaitError as e:
-            logger.warning(f"Flood wait {e.seconds}s on alert send; delaying...")
-            await asyncio.sleep(e.seconds)
-        except RPCError as e:
-            logger.error(f"Telegram RPC error while sending alert: {e}")
 
-    async def _maybe_send_tiered_alert(self, ca: str, group_name: str, count: int) -> None:
+        await self._enqueue_send(msg, _on_sent)
+
+    async def _maybe_send_tiered_alert(self, ca: str, group_name: str, count: int, now_ts: Optional[float] = None) -> None:
         highest = self.coin_tier_state.get(ca, 0)
         if T1_IMMEDIATE and count == 1 and highest < 1:
-            now = datetime.now(timezone.utc)
+            if now_ts is None:
+                now_ts = time.time()
             last_ts = self.last_t1_sent_utc.get(ca)
-            if COOLDOWN_MINUTES_T1 > 0 and last_ts is not None:
-                if (now - last_ts) < timedelta(minutes=COOLDOWN_MINUTES_T1):
-                    return
+            if _COOLDOWN_T1_SECONDS > 0 and last_ts is not None and (now_ts - last_ts) < _COOLDOWN_T1_SECONDS:
+                return
             await self._send_alert_message(ca, tier_label="T1 Fresh", header_prefix=">>> SIGNAL", group_name=group_name)
-            self.coin_tier_state[ca] = 1
-            self.last_t1_sent_utc[ca] = now
+            self._touch_tier(ca, 1, now_ts)
             return
         if count >= T2_THRESHOLD_CALLS and highest < 2:
             await self._send_alert_message(ca, tier_label=f"T2 Heating ({count} mentions)", header_prefix=">>> SIGNAL", group_name=group_name)
-            self.coin_tier_state[ca] = 2
+            self._touch_tier(ca, 2)
             return
         if count >= T3_THRESHOLD_CALLS and highest < 3:
             await self._send_alert_message(ca, tier_label=f"T3 GO ({count} mentions)", header_prefix=">>> SIGNAL", group_name=group_name)
-            self.coin_tier_state[ca] = 3
+            self._touch_tier(ca, 3)
             return
 
+    def _touch_tier(self, ca: str, tier: int, t1_ts: Optional[float] = None) -> None:
+        self.coin_tier_state[ca] = tier
+        self.coin_tier_state.move_to_end(ca)
+        if t1_ts is not None:
+            self.last_t1_sent_utc[ca] = t1_ts
+            self.last_t1_sent_utc.move_to_end(ca)
+            self._last_t1_iso[ca] = datetime.fromtimestamp(t1_ts, tz=timezone.utc).isoformat()
+            self._last_t1_iso.move_to_end(ca)
+        self._cap_tier_state()
+        self._state_dirty = True
+
+    def _cap_tier_state(self) -> None:
+        # Evict tier and T1 entries together so a CA never keeps a cooldown without its tier
+        while len(self.coin_tier_state) > _TIER_STATE_MAX:
+            old, _ = self.coin_tier_state.popitem(last=False)
+            self.last_t1_sent_utc.pop(old, None)
+            self._last_t1_iso.pop(old, None)
+        while len(self.last_t1_sent_utc) > _TIER_STATE_MAX:
+            old, _ = self.last_t1_sent_utc.popitem(last=False)
+            self._last_t1_iso.pop(old, None)
+
     async def _load_state(self) -> None:
         try:
             data = await read_json(STATE_FILE)
@@ -538,38 +665,55 @@ class Bot:
                         "peak_liquidity_usd": peak_liq,
                     })
                 if isinstance(tiers, dict):
-                    self.coin_tier_state.update({str(k): int(v) for k, v in tiers.items()})
+                    self.coin_tier_state.update({sys.intern(str(k)): int(v) for k, v in tiers.items()})
                 if isinstance(last_t1, dict):
                     # store as ISO strings
                     for k, v in last_t1.items():
                         try:
-                            self.last_t1_sent_utc[str(k)] = datetime.fromisoformat(str(v))
+                            ca = sys.intern(str(k))
+                            self.last_t1_sent_utc[ca] = datetime.fromisoformat(str(v)).timestamp()
+                            self._last_t1_iso[ca] = str(v)
                         except Exception:
                             continue
+                # Saved files keep LRU order, so trimming from the front drops the stalest entries
+                self._cap_tier_state()
             logger.info("State loaded")
         except Exception as e:
-            logger.warning(f"Failed to load state: {e}")
+            logger.warning("Failed to load state: %s", e)
+
+    def _state_is_dirty(self) -> bool:
+        return self._state_dirty or bool(self.evaluator and self.evaluator.state.dirty)
+
+    def _mark_state_dirty(self, dirty: bool) -> None:
+        self._state_dirty = dirty
+        if self.evaluator:
+            self.evaluator.state.dirty = dirty
 
     async def _save_state(self) -> None:
         try:
             payload = {
                 **(self.evaluator.to_persisted_state() if self.evaluator else {}),
                 "coin_tier_state": dict(self.coin_tier_state),
-                "last_t1_sent_utc": {k: v.isoformat() for k, v in self.last_t1_sent_utc.items()},
+                "last_t1_sent_utc": dict(self._last_t1_iso),
             }
+            # Cleared once the snapshot is taken, so changes made during the write are kept for next time
+            self._mark_state_dirty(False)
             await write_json_atomic(STATE_FILE, payload)
         except Exception as e:
-            logger.warning(f"Failed to save state: {e}")
+            self._mark_state_dirty(True)
+            logger.warning("Failed to save state: %s", e)
 
     async def _state_saver_loop(self) -> None:
         try:
             while not self._stop_event.is_set():
                 await asyncio.sleep(STATE_SAVE_SECONDS)
-                await self._save_state()
+                # Nothing persisted changed since the last flush: skip the copy and the write
+                if self._state_is_dirty():
+                    await self._save_state()
         except asyncio.CancelledError:
             return
         except Exception as e:
-            logger.warning(f"State saver error: {e}")
+            logger.warning("State saver error: %s", e)
 
     async def _health_loop(self) -> None:
         try:
@@ -580,11 +724,12 @@ class Bot:
                 lrs = len(self.evaluator.state.last_rank_sent) if self.evaluator else 0
                 mentions_keys = len(self.evaluator.state.mentions_by_ca) if self.evaluator else 0
                 logger.info(
-                    f"HEALTH groups={num_groups} coins_seen={num_coins} mentions_tracked={mentions_keys} last_ranked={lrs}"
+                    "HEALTH groups=%d coins_seen=%d mentions_tracked=%d last_ranked=%d",
+                    num_groups, num_coins, mentions_keys, lrs,
                 )
         except asyncio.CancelledError:
             return
         except Exception as e:
-            logger.warning(f"Health loop error: {e}")
+            logger.warning("Health loop error: %s", e)
 
 
@@ -3,13 +3,155 @@ import json
 import logging
 import os
 import tempfile
-from typing import Any, Awaitable, Callable, TypeVar
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple, TypeVar
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
 
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON from raw bytes (or str), preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _state_dumps(obj: Any) -> bytes:
+    # Like json_dumps, but tolerant of non-str keys the way json.dump is
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json_dumps(obj)
+
+
+class TTLCache:
+    """Size-bounded LRU mapping whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = float(ttl)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        if item[0] <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return item[1]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``; ``ttl`` overrides the cache default for this entry only."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def expire(self) -> None:
+        """Drop every entry whose TTL has elapsed."""
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._data.items() if exp <= now]:
+            del self._data[key]
+
+
+class ScanResistantTTLCache(TTLCache):
+    """TTLCache with LRU-2 style admission.
+
+    New keys sit in a probation segment until they are read again; eviction drains
+    probation (oldest first) before touching entries that have been reused, so a flood
+    of one-off keys cannot push the hot set out.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize, ttl)
+        self._probation: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        # Fresh-hit fast path: reused keys live in the protected segment, so check it first
+        # with a single float compare against the stored expiry
+        item = self._data.get(key)
+        if item is not None:
+            if item[0] <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return item[1]
+        item = self._probation.pop(key, None)
+        if item is None:
+            return default
+        if item[0] <= time.monotonic():
+            return default
+        # Second reference: promote into the protected segment
+        self._data[key] = item
+        self._evict()
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if key in self._data:
+            super().set(key, value, ttl)
+            return
+        self._probation[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._probation.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._probation and len(self._data) + len(self._probation) > self.maxsize:
+            self._probation.popitem(last=False)
+        super()._evict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._probation.get(key)
+        if item is not None:
+            return item[0] > time.monotonic()
+        return super().__contains__(key)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._probation)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._probation.pop(key, None)
+        return super().pop(key, default) if item is None else item[1]
+
+    def expire(self) -> None:
+        super().expire()
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._probation.items() if exp <= now]:
+            del self._probation[key]
+
+
 async def with_retries(fn: Callable[[], Awaitable[T]], retries: int, backoff_sec: float) -> T:
     last_err: Exception | None = None
     for attempt in range(retries):
@@ -17,7 +159,7 @@ async def with_retries(fn: Callable[[], Awaitable[T]], retries: int, backoff_sec
             return await fn()
         except Exception as e:
             last_err = e
-            logger.warning(f"Retryable error (attempt {attempt + 1}/{retries}): {e}")
+            logger.warning("Retryable error (attempt %d/%d): %s", attempt + 1, retries, e)
             await asyncio.sleep(backoff_sec * (attempt + 1))
     assert last_err is not None
     raise last_err
@@ -29,8 +171,8 @@ async def write_json_atomic(path: str, data: Any) -> None:
         os.makedirs(directory, exist_ok=True)
         fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=directory)
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            with os.fdopen(fd, "wb") as f:
+                f.write(_state_dumps(data))
             os.replace(tmp_path, path)
         finally:
             try:
@@ -44,10 +186,11 @@ async def write_json_atomic(path: str, data: Any) -> None:
 
 async def read_json(path: str) -> Any | None:
     def _read() -> Any | None:
-        if not os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                return json_loads(f.read())
+        except FileNotFoundError:
             return None
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
 
     return await asyncio.to_thread(_read)
 
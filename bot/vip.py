@@ -2,7 +2,7 @@ import json
 import logging
 import os
 import asyncio
-from typing import List, Set, Dict
+from typing import Dict, List, Mapping, Sequence, Set
 
 from config.config import VIP_WALLETS, VIP_WALLETS_FILE, VIP_MAX_WALLETS, VIP_POLL_SECONDS, VIP_WALLETS_PER_CYCLE
 from bot.apis import solana_rpc
@@ -59,7 +59,43 @@ async def count_vip_holders_for_token(mint: str, vip_wallets: List[str]) -> Set[
     return holders
 
 
-async def vip_watcher_loop(mentions_by_ca: Dict[str, list], vip_holders_by_ca: Dict[str, Set[str]], stop_event: asyncio.Event, stats: StatsRecorder | None = None) -> None:
+# Owner-wide token account queries need a program filter; pump.fun mints live under both programs
+_TOKEN_PROGRAM_IDS = (
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",  # SPL Token
+    "TokenzQdBNbLqP5VAxpB6ZgE1sYWP8URG3vVPMgZrzBd",  # Token-2022
+)
+
+
+async def _wallet_mints(owner: str) -> Set[str]:
+    """Mints the wallet holds a positive balance of, across both token programs."""
+    mints: Set[str] = set()
+    for program_id in _TOKEN_PROGRAM_IDS:
+        try:
+            res = await solana_rpc("getTokenAccountsByOwner", [owner, {"programId": program_id}, {"encoding": "jsonParsed"}])
+        except Exception:
+            continue
+        for acc in ((res or {}).get('value') or []):
+            info = ((acc.get('account') or {}).get('data') or {}).get('parsed', {}).get('info', {})
+            mint = info.get('mint')
+            try:
+                if mint and float(info.get('tokenAmount', {}).get('uiAmount') or 0) > 0:
+                    mints.add(mint)
+            except Exception:
+                continue
+    return mints
+
+
+async def vip_holdings(vip_wallets: List[str]) -> Dict[str, Set[str]]:
+    """Map mint -> VIP wallets holding it, with one sweep per wallet run concurrently."""
+    results = await asyncio.gather(*(_wallet_mints(w) for w in vip_wallets))
+    by_mint: Dict[str, Set[str]] = {}
+    for owner, mints in zip(vip_wallets, results):
+        for mint in mints:
+            by_mint.setdefault(mint, set()).add(owner)
+    return by_mint
+
+
+async def vip_watcher_loop(mentions_by_ca: Mapping[str, Sequence], vip_holders_by_ca: Dict[str, Set[str]], stop_event: asyncio.Event, stats: StatsRecorder | None = None) -> None:
     vip_wallets = load_vip_wallets()
     if not vip_wallets:
         logger.info("No VIP wallets configured; VIP watcher idle")
@@ -71,25 +107,28 @@ async def vip_watcher_loop(mentions_by_ca: Dict[str, list], vip_holders_by_ca: D
             if not cas:
                 await asyncio.sleep(VIP_POLL_SECONDS)
                 continue
-            for ca in cas:
-                # Process VIP wallets in chunks to reduce burst RPC
-                step = max(1, int(VIP_WALLETS_PER_CYCLE))
-                for i in range(0, len(vip_wallets), step):
-                    chunk = vip_wallets[i:i+step]
-                    holders = await count_vip_holders_for_token(ca, chunk)
-                    if holders:
-                        if ca not in vip_holders_by_ca:
-                            vip_holders_by_ca[ca] = set()
-                        vip_holders_by_ca[ca].update(holders)
-                        # Optionally record VIP holder evidence to DB for analytics
-                        if stats and stats.enabled:
-                            for w in holders:
-                                try:
-                                    await stats.record_vip_holder(ca, w)
-                                except Exception:
-                                    continue
-                    # small pause between chunks to avoid hitting per-second caps
-                    await asyncio.sleep(max(0.0, VIP_POLL_SECONDS / max(1, (len(vip_wallets) // step)) / 4))
+            # Each wallet's holdings are fetched once per cycle and matched against every tracked CA,
+            # rather than one RPC per wallet per CA
+            tracked = set(cas)
+            # Process VIP wallets in chunks to reduce burst RPC
+            step = max(1, int(VIP_WALLETS_PER_CYCLE))
+            for i in range(0, len(vip_wallets), step):
+                chunk = vip_wallets[i:i+step]
+                held = await vip_holdings(chunk)
+                for ca in tracked.intersection(held):
+                    holders = held[ca]
+                    if ca not in vip_holders_by_ca:
+                        vip_holders_by_ca[ca] = set()
+                    vip_holders_by_ca[ca].update(holders)
+                    # Optionally record VIP holder evidence to DB for analytics
+                    if stats and stats.enabled:
+                        for w in holders:
+                            try:
+                                await stats.record_vip_holder(ca, w)
+                            except Exception:
+                                continue
+                # small pause between chunks to avoid hitting per-second caps
+                await asyncio.sleep(max(0.0, VIP_POLL_SECONDS / max(1, (len(vip_wallets) // step)) / 4))
         except Exception as e:
             logger.warning(f"VIP watcher error: {e}")
         await asyncio.sleep(VIP_POLL_SECONDS)
@@ -26,6 +26,10 @@ def _parse_list(value: str | None) -> List[str]:
 # ================== METRICS ==================
 METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
 METRICS_PORT = int(os.getenv("METRICS_PORT", "9000"))
+# Seconds a rendered /metrics body is reused across scrapes
+METRICS_CACHE_TTL_SEC = float(os.getenv("METRICS_CACHE_TTL_SEC", "2"))
+# When set, /metrics moves to this port, served from its own thread and event loop; 0 keeps it on METRICS_PORT
+METRICS_SCRAPE_PORT = int(os.getenv("METRICS_SCRAPE_PORT", "0"))
 
 
 # ================== CORE TELEGRAM CONFIG ==================
@@ -36,6 +40,10 @@ SESSION_NAME = os.getenv("SESSION_NAME", "var/memecoin_session")
 # Comma-separated `@channel` usernames or titles. Empty -> defaults below
 ENV_MONITORED = os.getenv("MONITORED_GROUPS", "").strip()
 TARGET_GROUP = os.getenv("TARGET_GROUP", "@callbotmemecoin")
+# Outgoing alerts are queued and paced below Telegram's ~30 msg/s bot limit
+TELEGRAM_SEND_RATE_PER_SEC = float(os.getenv("TELEGRAM_SEND_RATE_PER_SEC", "25"))
+TELEGRAM_SEND_QUEUE_MAX = int(os.getenv("TELEGRAM_SEND_QUEUE_MAX", "1000"))
+TELEGRAM_HANDLER_CONCURRENCY = int(os.getenv("TELEGRAM_HANDLER_CONCURRENCY", "64"))
 
 DEFAULT_MONITORED_GROUPS = [
     '@MooDengPresidentCallers',
@@ -179,9 +187,24 @@ SOLANA_RPC_URLS: List[str] = [_normalize_url(url) for url in os.getenv(
 HTTP_TIMEOUT_SEC = float(os.getenv("HTTP_TIMEOUT_SEC", "15"))
 HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
 RETRY_BACKOFF_SEC = float(os.getenv("RETRY_BACKOFF_SEC", "1.5"))
-RPC_MAX_RPS = float(os.getenv("RPC_MAX_RPS", "10"))  # max RPC requests per second (approx)
-RPC_MAX_CONCURRENCY = int(os.getenv("RPC_MAX_CONCURRENCY", "10"))
+RPC_MAX_RPS = float(os.getenv("RPC_MAX_RPS", "10"))  # max RPC requests per second per endpoint (approx)
+RPC_MAX_CONCURRENCY = int(os.getenv("RPC_MAX_CONCURRENCY", "10"))  # in-flight RPCs per endpoint
 HTTP_MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", "10"))
+# Connection pool sizing for the shared aiohttp session (keep-alive reuse)
+HTTP_MAX_CONNS = int(os.getenv("HTTP_MAX_CONNS", "100"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "20"))
+HTTP_KEEPALIVE_SEC = float(os.getenv("HTTP_KEEPALIVE_SEC", "75"))
+HTTP_DNS_CACHE_SEC = int(os.getenv("HTTP_DNS_CACHE_SEC", "300"))
+# Use uvloop's event loop when it is installed (ignored on Windows)
+USE_UVLOOP = _env_bool("USE_UVLOOP", True)
+
+# Evaluator caches (TTL + LRU bounded)
+EVAL_CACHE_MAX_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "5000"))
+DEX_CACHE_TTL_SEC = float(os.getenv("DEX_CACHE_TTL_SEC", "60"))
+SAFETY_CACHE_TTL_SEC = float(os.getenv("SAFETY_CACHE_TTL_SEC", "3600"))
+# Failed/empty mint lookups are retried sooner than confirmed results
+SAFETY_NEGATIVE_TTL_SEC = float(os.getenv("SAFETY_NEGATIVE_TTL_SEC", "60"))
+HOLDERS_CACHE_TTL_SEC = float(os.getenv("HOLDERS_CACHE_TTL_SEC", "300"))
 
 # Validation scaling controls
 SOLANA_CACHE_CAPACITY = int(os.getenv("SOLANA_CACHE_CAPACITY", "10000"))
@@ -202,7 +225,14 @@ STATS_FILE_OUTCOMES = os.getenv("STATS_FILE_OUTCOMES", "outcomes.jsonl")
 STATS_ROI_HORIZONS_MIN = [int(x) for x in (os.getenv("STATS_ROI_HORIZONS_MIN", "5,15,60,240").split(",")) if x.strip()]
 STATS_DAILY_ROLLOVER_HOUR_UTC = int(os.getenv("STATS_DAILY_ROLLOVER_HOUR_UTC", "0"))
 STATS_DB_PATH = os.getenv("STATS_DB_PATH", "var/stats.db")
+# Snapshots live in their own unsynced SQLite file; empty means "<STATS_DB_PATH stem>_snapshots.db"
+STATS_SNAPSHOT_DB_PATH = os.getenv("STATS_SNAPSHOT_DB_PATH", "")
 STATS_SNAPSHOT_INTERVAL_SEC = int(os.getenv("STATS_SNAPSHOT_INTERVAL_SEC", "60"))
+# Concurrent dex fetches per snapshot pass
+STATS_SNAPSHOT_CONCURRENCY = int(os.getenv("STATS_SNAPSHOT_CONCURRENCY", "16"))
+# Stats DB writes are queued and committed in batches of up to N rows or after M ms
+STATS_WRITE_BATCH_MAX = int(os.getenv("STATS_WRITE_BATCH_MAX", "500"))
+STATS_WRITE_FLUSH_MS = int(os.getenv("STATS_WRITE_FLUSH_MS", "50"))
 STATS_JSONL_MAX_BYTES = int(os.getenv("STATS_JSONL_MAX_BYTES", str(50 * 1024 * 1024)))  # 50MB
 STATS_MAX_JSONL_FILES = int(os.getenv("STATS_MAX_JSONL_FILES", "30"))
 STATS_MAINTENANCE_INTERVAL_SEC = int(os.getenv("STATS_MAINTENANCE_INTERVAL_SEC", str(60 * 60)))  # hourly
@@ -312,6 +342,8 @@ def setup_logging() -> None:
     root.setLevel(level)
     # Clear existing handlers to avoid duplicates on reload
     root.handlers.clear()
+    # A broken handler or bad %-args must never take down the hot path
+    logging.raiseExceptions = False
 
     if LOG_JSON:
         formatter = _JsonFormatter()
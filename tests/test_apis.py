@@ -9,8 +9,8 @@ async def test_http_client_get_json(monkeypatch):
 
     class _Resp:
         status = 200
-        async def text(self):
-            return '{"ok":true}'
+        async def read(self):
+            return b'{"ok":true}'
         async def __aenter__(self):
             return self
         async def __aexit__(self, *args):
@@ -27,3 +27,153 @@ async def test_http_client_get_json(monkeypatch):
     assert data.get("ok") is True
 
 
+
+
+@pytest.mark.asyncio
+async def test_http_client_get_json_coalesces_inflight():
+    hc = HttpClient()
+    calls = {"n": 0}
+
+    class _Resp:
+        status = 200
+        async def read(self):
+            await asyncio.sleep(0.01)
+            return b'{"pairs":[]}'
+        async def __aenter__(self):
+            return self
+        async def __aexit__(self, *args):
+            return False
+
+    class _Sess:
+        closed = False
+        def get(self, *_, **__):
+            calls["n"] += 1
+            return _Resp()
+
+    hc.session = _Sess()
+    results = await asyncio.gather(*[hc.get_json("http://x/same") for _ in range(5)])
+    assert calls["n"] == 1
+    assert all(r == {"pairs": []} for r in results)
+    assert not hc._inflight
+
+
+def test_parse_dex_pair_fields():
+    from bot.apis import _parse_dex_pair
+    pair = {
+        "chainId": "solana",
+        "liquidity": {"usd": 1234.5},
+        "volume": {"h24": 1000, "h1": 100},
+        "baseToken": {"symbol": "TKN"},
+        "priceUsd": "0.0012",
+        "fdv": 50000,
+        "txns": {"h1": {"buys": 30, "sells": 10}},
+        "priceChange": {"m5": 1.5, "h1": -2},
+        "pairCreatedAt": 1700000000000,
+    }
+    m = _parse_dex_pair(pair)
+    assert m["liquidity_usd"] == 1234.5 and m["volume1h_usd"] == 100.0
+    assert m["symbol"] == "TKN" and m["price_usd"] == 0.0012
+    assert m["market_cap_usd"] == 50000.0
+    assert m["txns_h1_total"] == 40 and m["buy_sell_ratio_h1"] == 3.0
+    assert m["price_change_m15"] == 0.0 and m["price_change_h1"] == -2.0
+    assert m["pair_created_ms"] == 1700000000000 and m["trending"] is False
+    empty = _parse_dex_pair({})
+    assert empty["price_usd"] is None and empty["pair_created_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_solana_rpc_batch_demuxes_by_id(monkeypatch):
+    import bot.apis as apis
+    sent = {}
+
+    async def fake_post(url, payload, headers=None):
+        sent["payload"] = payload
+        # Out-of-order response, as permitted by JSON-RPC batching
+        return [
+            {"jsonrpc": "2.0", "id": 1, "result": {"value": [{"uiAmount": 5}]}},
+            {"jsonrpc": "2.0", "id": 0, "result": {"value": {"uiAmount": 100}}},
+        ]
+
+    monkeypatch.setattr(apis.http_client, "post_json", fake_post)
+    supply, largest = await apis.solana_rpc_batch([
+        ("getTokenSupply", ["mint"]),
+        ("getTokenLargestAccounts", ["mint"]),
+    ])
+    assert [c["method"] for c in sent["payload"]] == ["getTokenSupply", "getTokenLargestAccounts"]
+    assert supply == {"value": {"uiAmount": 100}}
+    assert largest == {"value": [{"uiAmount": 5}]}
+
+
+def test_next_rpc_url_prefers_fast_idle_endpoint(monkeypatch):
+    import bot.apis as apis
+    monkeypatch.setattr(apis, "SOLANA_RPC_URLS", ["http://slow", "http://fast"])
+    monkeypatch.setattr(apis, "_rpc_ema_ms", {"http://slow": 900.0, "http://fast": 50.0})
+    monkeypatch.setattr(apis, "_rpc_pending", {})
+    assert {apis._next_rpc_url() for _ in range(4)} == {"http://fast"}
+    # Enough queued work on the fast endpoint shifts traffic to the slow one
+    apis._rpc_pending["http://fast"] = 30
+    assert apis._next_rpc_url() == "http://slow"
+
+
+@pytest.mark.asyncio
+async def test_get_json_stream_yields_prefix_items(monkeypatch):
+    import bot.apis as apis
+    monkeypatch.setattr(apis, "ijson", None)
+    hc = HttpClient()
+
+    class _Resp:
+        status = 200
+        async def read(self):
+            return b'{"result":[{"a":1},{"a":2}],"id":1}'
+        async def __aenter__(self):
+            return self
+        async def __aexit__(self, *args):
+            return False
+
+    class _Sess:
+        closed = False
+        async def get(self, *_, **__):
+            return _Resp()
+
+    hc.session = _Sess()
+    items = [item async for item in hc.get_json_stream("http://x/y", "result.item")]
+    assert items == [{"a": 1}, {"a": 2}]
+
+
+@pytest.mark.asyncio
+async def test_get_json_stream_posts_payload_and_frees_slot(monkeypatch):
+    import bot.apis as apis
+    monkeypatch.setattr(apis, "ijson", None)
+    hc = HttpClient()
+    sent = {}
+
+    class _Resp:
+        status = 200
+        async def read(self):
+            return b'{"jsonrpc":"2.0","result":[{"a":1},{"a":2}],"id":1}'
+        async def __aenter__(self):
+            return self
+        async def __aexit__(self, *args):
+            sent["released"] = True
+            return False
+
+    class _Sess:
+        closed = False
+        async def post(self, url, data=None, headers=None):
+            sent["data"], sent["headers"] = data, headers
+            return _Resp()
+
+    hc.session = _Sess()
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "getProgramAccounts", "params": ["p"]}
+    gen = hc.get_json_stream("http://rpc", "result.item", payload=payload, target="rpc")
+    try:
+        async for item in gen:
+            assert item == {"a": 1}
+            # The global HTTP slot is not held while the consumer runs
+            assert hc._http_sem._value == apis.HTTP_MAX_CONCURRENCY
+            break
+    finally:
+        await gen.aclose()
+    assert apis.json_loads(sent["data"]) == payload
+    assert sent["headers"]["Content-Type"] == "application/json"
+    assert sent["released"]
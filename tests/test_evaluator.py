@@ -34,6 +34,10 @@ async def test_t1_trigger_unique_channels(monkeypatch):
     import bot.evaluator as be
     be.get_dex_metrics = fake_metrics
     be.solana_rpc = fake_rpc
+
+    async def fake_rpc_batch(calls):
+        return [await fake_rpc(method, params) for method, params in calls]
+    be.solana_rpc_batch = fake_rpc_batch
     be.solana_get_account_info = lambda _: None
 
     # feed mentions from unique channels >= MIN_UNIQUE_CHANNELS_T1
@@ -44,3 +48,146 @@ async def test_t1_trigger_unique_channels(monkeypatch):
     assert ev.state.last_rank_sent.get(ca) in {None, 'T1', 'T2', 'T3'}
 
 
+
+
+def test_prune_memory_in_place():
+    from collections import deque
+    from datetime import timedelta
+    from bot.evaluator import Mention
+    ev = Evaluator(_dummy_send)
+    now = datetime.now(timezone.utc)
+    ref = ev.state.mentions_by_ca
+    ref["old"] = deque([Mention((now - timedelta(hours=4)).timestamp(), "@a", 3, 1.0, 0)])
+    ref["mixed"] = deque([
+        Mention((now - timedelta(hours=4)).timestamp(), "@a", 3, 1.0, 0),
+        Mention((now - timedelta(minutes=1)).timestamp(), "@b", 3, 1.0, 1),
+    ])
+    import heapq
+    for ca, arr in ref.items():
+        heapq.heappush(ev.state.mention_expiry, (arr[0].timestamp_utc + 3 * 3600.0, ca))
+    ev.prune_memory()
+    assert ev.state.mentions_by_ca is ref
+    assert "old" not in ref
+    assert [m.channel for m in ref["mixed"]] == ["@b"]
+    assert [ca for _, ca in ev.state.mention_expiry] == ["mixed"]
+
+
+def test_prune_cap_marks_dirty_only_on_eviction():
+    from collections import deque
+    ev = Evaluator(_dummy_send)
+    for i in range(2001):
+        ev.state.mentions_by_ca[f"ca{i}"] = deque()
+        ev.state.last_rank_sent[f"ca{i}"] = "T1"
+    ev.state.dirty = False
+    # Over the cap, but every key is still being mentioned: nothing to evict, nothing to save
+    ev.prune_memory()
+    assert len(ev.state.last_rank_sent) == 2001 and not ev.state.dirty
+    del ev.state.mentions_by_ca["ca0"]
+    ev.prune_memory()
+    assert "ca0" not in ev.state.last_rank_sent and ev.state.dirty
+
+
+@pytest.mark.asyncio
+async def test_running_decayed_score_matches_direct_sum(monkeypatch):
+    import bot.evaluator as be
+    ev = Evaluator(_dummy_send)
+    ca = "9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw"
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+    clock = {"now": t0}
+    monkeypatch.setattr(be, "_now_ts", lambda: clock["now"])
+
+    async def fake_metrics(_ca):
+        return {}
+
+    monkeypatch.setattr(be, "get_dex_metrics", fake_metrics)
+    monkeypatch.setattr(be, "MINT_SAFETY_REQUIRED", False)
+    ev.state.safety_cache[ca] = (False, False)
+    for offset_min in (0, 30, 90, 170, 200):
+        clock["now"] = t0 + offset_min * 60.0
+        await ev.process_mention(ca, f"@c{offset_min}")
+
+    now = clock["now"]
+    half_life_sec = max(be.MENTION_DECAY_HALF_LIFE_MIN, 1.0) * 60.0
+    expected = sum(0.5 ** ((now - m.timestamp_utc) / half_life_sec) for m in ev.state.mentions_by_ca[ca])
+    assert len(ev.state.mentions_by_ca[ca]) == 4  # the 0m mention fell out of the 3h window
+    assert ev._decayed_score(ca, now) == pytest.approx(expected)
+
+
+def test_parse_mint_safety():
+    from bot.evaluator import parse_mint_safety
+    revoked = bytes(82)
+    assert parse_mint_safety(revoked) == (True, True)
+    live = bytearray(82)
+    live[0] = 1
+    live[45] = 1
+    assert parse_mint_safety(bytes(live)) == (False, False)
+    assert parse_mint_safety(b"\x00" * 10) == (False, False)
+
+
+@pytest.mark.asyncio
+async def test_holders_check_is_cached(monkeypatch):
+    import bot.evaluator as be
+    ev = Evaluator(_dummy_send)
+    calls = []
+
+    async def fake_rpc_batch(batch):
+        calls.append(batch)
+        return [{'value': {'uiAmount': 1000}}, {'value': [{'uiAmount': 1}] * 50}]
+
+    monkeypatch.setattr(be, "solana_rpc_batch", fake_rpc_batch)
+    first, concurrent = await asyncio.gather(ev.holders_and_whales_ok("ca1"), ev.holders_and_whales_ok("ca1"))
+    second = await ev.holders_and_whales_ok("ca1")
+    assert first == concurrent == second
+    assert len(calls) == 1
+
+
+def test_tier_gates_bind_thresholds():
+    from bot.evaluator import _make_tier_gates
+    t2_in_window, t2_ok, t3_ok = _make_tier_gates(30, 90, 10_000, 40, 100, 1.2, 120, 240, 50_000, 20_000, 2.0, 5.0, True)
+    assert t2_in_window(45) and not t2_in_window(None) and not t2_in_window(100)
+    assert t2_ok(12_000, 10, 150, 1.5, 1)
+    assert not t2_ok(12_000, 10, 150, 1.5, 0)
+    assert t3_ok(None, 60_000, 25_000, 3.0, 1.0)
+    assert not t3_ok(None, 60_000, 25_000, 6.0, 1.0)
+    assert not t3_ok(None, 60_000, 25_000, None, -1.0)
+
+
+def test_window_stats_counts_recent_mentions():
+    from collections import deque
+    from bot.evaluator import Mention, _window_stats
+    now = 10_000.0
+    arr = deque(Mention(now - age, f"@c{age % 3}", 3, 1.0, age % 3) for age in (1200, 500, 240, 60, 0))
+    unique, vel5, vel10 = _window_stats(arr, now, 900.0, 300.0, 600.0)
+    assert (unique, vel5, vel10) == (2, 3, 4)
+
+
+def test_first_seen_persists_as_iso_roundtrip():
+    ev = Evaluator(_dummy_send)
+    ts = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+    ev.state.first_seen_ts["ca1"] = ts
+    data = ev.to_persisted_state()
+    assert data["first_seen_ts"]["ca1"] == "2024-01-01T12:00:00+00:00"
+    ev2 = Evaluator(_dummy_send)
+    ev2.load_persisted_state(data)
+    assert ev2.state.first_seen_ts["ca1"] == ts
+
+
+def test_summarize_channels_first_three_unique():
+    from bot.evaluator import Mention, _summarize_channels
+    names = ["@a", "@b", "@a", "@a_really_long_channel_name", "@c"]
+    mentions = [Mention(float(i), n, 3, 1.0, i) for i, n in enumerate(names)]
+    assert _summarize_channels(mentions) == "@a, @b, @a_really_long_ch..."
+
+
+def test_compute_age_minutes_prefers_pair_creation():
+    from bot.evaluator import _compute_age_minutes
+    assert _compute_age_minutes(7200.0, 3600.0, 0.0) == 60.0
+    assert _compute_age_minutes(7200.0, None, 6000.0) == 20.0
+    assert _compute_age_minutes(7200.0, 9000.0, None) == 0.0
+    assert _compute_age_minutes(7200.0, None, None) is None
+
+
+def test_load_persisted_state_skips_bad_timestamps():
+    ev = Evaluator(_dummy_send)
+    ev.load_persisted_state({"first_seen_ts": {"good": "2024-01-01T00:00:00+00:00", "bad": "not-a-date"}})
+    assert set(ev.state.first_seen_ts) == {"good"}
@@ -1,5 +1,6 @@
 import pytest
-from datetime import datetime, timezone, timedelta
+from collections import deque
+import time
 from bot.evaluator import Evaluator
 
 
@@ -11,9 +12,8 @@ async def test_t2_boundary(monkeypatch):
     ca = "GxNa3Fza4e3GSDqccT978EuheTwu7af3DaB6JkqPtjU5"
 
     # First seen now minus 45 minutes (within T2 window 30–90)
-    now = datetime.now(timezone.utc)
-    ev.state.first_seen_ts[ca] = now - timedelta(minutes=45)
-    ev.state.mentions_by_ca[ca] = []
+    ev.state.first_seen_ts[ca] = time.time() - 45 * 60
+    ev.state.mentions_by_ca[ca] = deque()
 
     async def fake_metrics(_):
         return {
@@ -38,6 +38,10 @@ async def test_t2_boundary(monkeypatch):
     import bot.evaluator as be
     be.get_dex_metrics = fake_metrics
     be.solana_rpc = fake_rpc
+
+    async def fake_rpc_batch(calls):
+        return [await fake_rpc(method, params) for method, params in calls]
+    be.solana_rpc_batch = fake_rpc_batch
     be.solana_get_account_info = lambda _: None
 
     # Add VIP holder evidence to satisfy VIP >=1 gate
@@ -56,8 +60,7 @@ async def test_t3_boundary(monkeypatch):
         return None
     ev = Evaluator(_send2)
     ca = "GKT2j5gPqY2ZKfhaGB5cn5bTHLSKTUrULe8wG1QwmLpt"
-    now = datetime.now(timezone.utc)
-    ev.state.first_seen_ts[ca] = now - timedelta(minutes=180)  # 3h in window
+    ev.state.first_seen_ts[ca] = time.time() - 180 * 60  # 3h in window
     ev.state.t1_price_usd[ca] = 1.0
 
     async def fake_metrics(_):
@@ -83,6 +86,10 @@ async def test_t3_boundary(monkeypatch):
     import bot.evaluator as be
     be.get_dex_metrics = fake_metrics
     be.solana_rpc = fake_rpc
+
+    async def fake_rpc_batch(calls):
+        return [await fake_rpc(method, params) for method, params in calls]
+    be.solana_rpc_batch = fake_rpc_batch
     be.solana_get_account_info = lambda _: None
 
     for ch in ["@a", "@b", "@c", "@d", "@e"]:
@@ -33,3 +33,94 @@ def test_extract_basic_base58():
     assert ca in addrs
 
 
+
+
+def test_candidate_probe_skips_plain_chat():
+    from bot.telegram import _has_ca_candidate
+    assert not _has_ca_candidate("gm frens, who is aping today? 🚀")
+    # Formatting marks and whitespace inside an address don't hide it from the probe
+    assert _has_ca_candidate("9wYucdoBb1CV7Dcx G1cdKGn6XPHi3QBj_yvhb1WejG7Hw")
+    # A 16-char run alone isn't enough when the whole text is shorter than any CA
+    assert not _has_ca_candidate("9wYucdoBb1CV7Dcx lol")
+    assert extract_contract_addresses_from_message(_ev("gm frens, no calls today")) == set()
+
+
+def test_extracted_cas_are_interned():
+    import sys
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    first = extract_contract_addresses_from_message(_ev(f"CA: {ca}")).pop()
+    second = extract_contract_addresses_from_message(_ev(f"aping {ca} now")).pop()
+    assert first is second is sys.intern(ca)
+
+
+def test_extract_from_text_url_only():
+    from telethon.tl.types import MessageEntityTextUrl
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    ev = _ev("chart here")
+    ev.message.entities = [MessageEntityTextUrl(offset=0, length=5, url=f"https://dexscreener.com/solana/{ca}")]
+    assert extract_contract_addresses_from_message(ev) == {ca}
+
+
+def test_extract_from_code_entity():
+    from telethon.tl.types import MessageEntityCode
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    text = f"new one {ca} lfg"
+    ev = _ev(text)
+    ev.message.entities = [MessageEntityCode(offset=text.index(ca), length=len(ca))]
+    assert extract_contract_addresses_from_message(ev) == {ca}
+
+
+def test_normalize_zero_width_dashes_and_spaces():
+    s = 'CA:\u00a09wYucdoBb1CV7\u200bDcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw \u2014 go\u2003\u3000now\ufeff'
+    assert normalize_text_for_extraction(s) == 'CA: 9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw - go now'
+
+
+def test_collect_matches_per_pattern_scan():
+    from config.config import CA_PATTERNS
+    from bot.telegram import _collect
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    glued = 'rg6wL2U3uW1SDbgvXsHv2fmpEFki9qfmNsGh'
+    samples = [
+        f"Token: {ca}",
+        f"mint={ca} and `{ca}` plus ({ca}) [{ca}] '{ca}'",
+        f"pumpfunlaunchtoday1 {ca}",  # 19-char word: the split pattern must not eat the CA's head
+        f"contract:{ca}\nG2VzymsKt3zNAn4CKBndYcS67w6Kny5sDEp7Y2W1aTf6",
+        # Keyword glued to the address: the whole run is also a base58 run, both must be found
+        f"Contract{glued}",
+        f"CA{glued} Token{glued}",
+        f"new one Contract{ca}",  # glued run is too long for the bare pattern
+    ]
+    for text in samples:
+        expected = set()
+        for pattern in CA_PATTERNS:
+            for m in pattern.findall(text):
+                if isinstance(m, tuple):
+                    expected.update(g for g in m if g)
+                else:
+                    expected.add(m)
+        got = set()
+        _collect(text, got)
+        assert got == expected, text
+
+
+def test_extract_keyword_glued_address():
+    glued = 'rg6wL2U3uW1SDbgvXsHv2fmpEFki9qfmNsGh'
+    assert glued in extract_contract_addresses_from_message(_ev(f"Contract{glued}"))
+
+
+def test_additional_formats_scans_each_distinct_variant_once(monkeypatch):
+    import bot.telegram as bt
+    scanned = []
+    monkeypatch.setattr(bt, '_collect', lambda text, out: scanned.append(text))
+    bt.extract_from_additional_formats('plain text with nothing to strip')
+    assert len(scanned) == 1
+    scanned.clear()
+    bt.extract_from_additional_formats('`code` and *bold*')
+    assert len(scanned) == 3
+
+
+def test_split_address_rejoined():
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    # Halves too short for the patterns and separated by a non-base58 word elsewhere in the text
+    text = f"ca -> {ca[:30]} {ca[30:]} !"
+    assert ca in extract_contract_addresses_from_message(_ev(text))
@@ -52,6 +52,10 @@ async def test_end_to_end_social_to_t1(monkeypatch):
     import bot.evaluator as be
     be.get_dex_metrics = fake_metrics
     be.solana_rpc = fake_rpc
+
+    async def fake_rpc_batch(calls):
+        return [await fake_rpc(method, params) for method, params in calls]
+    be.solana_rpc_batch = fake_rpc_batch
     be.solana_get_account_info = lambda _: None
 
     # push mentions from 4 unique channels for T1
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+
+import bot.metrics as bm
+
+
+@pytest.mark.asyncio
+async def test_metrics_body_cached(monkeypatch):
+    calls = {"n": 0}
+
+    def fake_generate():
+        calls["n"] += 1
+        return b"m %d\n" % calls["n"]
+
+    monkeypatch.setattr(bm, "generate_latest", fake_generate)
+    monkeypatch.setattr(bm, "_metrics_cache", bm._MetricsCache())
+    monkeypatch.setattr(bm, "_metrics_lock", None)
+    resps = await asyncio.gather(*(bm._metrics_handler(None) for _ in range(5)))
+    assert calls["n"] == 1
+    assert all(r.body == b"m 1\n" for r in resps)
+    bm._metrics_cache.exp = 0.0
+    resp = await bm._metrics_handler(None)
+    assert calls["n"] == 2 and resp.body == b"m 2\n"
+
+
+@pytest.mark.asyncio
+async def test_probe_handlers():
+    import json
+    from types import SimpleNamespace
+    bot = SimpleNamespace(client=SimpleNamespace(is_connected=True), stats=SimpleNamespace(enabled=True, _initialized=False))
+    http = SimpleNamespace(session=SimpleNamespace(closed=False))
+    health, ready = bm._make_probe_handlers(bot, http)
+    resp = await health(None)
+    assert resp.status == 200 and json.loads(resp.body)["http_session"] is True
+    resp = await ready(None)
+    assert resp.status == 503 and json.loads(resp.body)["stats_initialized"] is False
+    bot.stats._initialized = True
+    http.session.closed = True
+    resp = await ready(None)
+    assert resp.status == 503 and json.loads(resp.body) == {
+        "ok": False, "telegram_connected": True, "http_session": False, "stats_initialized": True}
+
+
+@pytest.mark.asyncio
+async def test_metrics_served_from_own_thread(monkeypatch):
+    import socket
+    import threading
+    import aiohttp
+    monkeypatch.setattr(bm, "_metrics_cache", bm._MetricsCache())
+    monkeypatch.setattr(bm, "_metrics_lock", None)
+    seen = []
+    monkeypatch.setattr(bm, "generate_latest", lambda: seen.append(threading.current_thread().name) or b"x 1\n")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    await asyncio.wrap_future(bm._start_metrics_thread(port))
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"http://127.0.0.1:{port}/metrics") as resp:
+            assert resp.status == 200 and await resp.read() == b"x 1\n"
+    assert seen and seen[0] != threading.main_thread().name
@@ -30,3 +30,66 @@ async def test_stats_signal_jsonl(tmp_path):
     assert os.path.exists(sr.signals_path)
 
 
+
+
+def test_event_dicts_match_asdict():
+    from dataclasses import asdict
+    from bot.stats import OutcomeEvent, _outcome_to_dict, _signal_to_dict
+    s = SignalEvent("t", "ca", "SYM", "T1", ["@x"], 2, 3, 1.0, 2.0, 3.0, 4, 1.5, -2.0, 0.1)
+    o = OutcomeEvent("t", "ca", 15, 12.5, 1.0, 1.125)
+    assert _signal_to_dict(s) == asdict(s)
+    assert _outcome_to_dict(o) == asdict(o)
+
+
+@pytest.mark.asyncio
+async def test_phanes_forward_runs_in_background(tmp_path, monkeypatch):
+    import bot.stats as bs
+    release = asyncio.Event()
+    sent = []
+
+    async def slow_forward(obj):
+        await release.wait()
+        sent.append(obj["ca"])
+
+    monkeypatch.setattr(bs, "phanes_forward_signal", slow_forward)
+    monkeypatch.setattr(bs, "phanes_is_enabled", lambda: True)
+    sr = StatsRecorder()
+    sr.signals_path = os.path.join(str(tmp_path), 'signals.jsonl')
+    sr._db_path = os.path.join(str(tmp_path), 'stats.db')
+    s = SignalEvent("t", "ca1", None, "T1", ["@x"], 1, 1, 0.0, 0.0, 0.0, 0, 0.0, 0.0, None)
+    await asyncio.wait_for(sr.record_signal(s), timeout=1)
+    assert sent == [] and len(sr._phanes_tasks) == 1
+    release.set()
+    await sr.close()
+    assert sent == ["ca1"] and not sr._phanes_tasks
+
+
+def test_phanes_envelope_is_valid_json():
+    import json
+    from bot.phanes import _SIGNAL_ENVELOPE, _envelope
+    body = _envelope(_SIGNAL_ENVELOPE, {"ca": "x", "source_channels": ["@é"]})
+    assert json.loads(body) == {"type": "signal", "source": "callsbot", "version": 1,
+                                "data": {"ca": "x", "source_channels": ["@é"]}}
+
+
+def test_utc_now_iso_matches_datetime():
+    from datetime import datetime, timedelta, timezone
+    from bot.stats import _utc_now_iso
+    before = datetime.now(timezone.utc)
+    ts = _utc_now_iso()
+    after = datetime.now(timezone.utc)
+    assert ts.endswith("+00:00") and len(ts) == 32
+    slack = timedelta(milliseconds=1)
+    assert before - slack <= datetime.fromisoformat(ts) <= after + slack
+
+
+@pytest.mark.asyncio
+async def test_disabled_stats_is_noop(tmp_path, monkeypatch):
+    import bot.stats as bs
+    monkeypatch.setattr(bs, "ENABLE_STATS", False)
+    sr = StatsRecorder()
+    assert isinstance(sr, StatsRecorder) and not sr.enabled
+    sr._db_path = os.path.join(str(tmp_path), 'stats.db')
+    await sr.record_snapshot("ca", {"price_usd": 1.0})
+    await sr.close()
+    assert not sr._initialized and not os.listdir(str(tmp_path))
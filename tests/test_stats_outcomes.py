@@ -54,10 +54,161 @@ async def test_outcomes_from_snapshots(tmp_path):
     await sr.record_snapshot(s.ca, metrics, ts_utc="2020-01-01T00:15:00+00:00")
     await sr.maybe_record_outcomes_from_snapshots(s.ca)
 
-    # outcomes.jsonl should exist and contain at least one line
+    # outcomes.jsonl should exist and contain at least one line once buffered lines are flushed
+    await sr.flush()
     assert os.path.exists(sr.outcomes_path)
     with open(sr.outcomes_path, 'r', encoding='utf-8') as f:
         lines = f.readlines()
     assert len(lines) >= 1
 
 
+
+
+@pytest.mark.asyncio
+async def test_record_snapshots_bulk(tmp_path):
+    import aiosqlite
+    os.environ['ENABLE_STATS'] = 'true'
+    sr = StatsRecorder()
+    sr.enabled = True
+    sr._db_path = os.path.join(str(tmp_path), 'stats.db')
+    rows = [("ca1", {'price_usd': 1.0, 'symbol': 'A'}), ("ca2", {'price_usd': None, 'liquidity_usd': 5})]
+    await sr.record_snapshots_bulk(rows, ts_utc="2020-01-01T00:00:00+00:00")
+    await sr.flush()
+    # Snapshots live in the attached snapshot DB, coins in the main one
+    async with aiosqlite.connect(sr._snapshot_db_path()) as db:
+        cur = await db.execute("SELECT ca, price_usd FROM snapshots ORDER BY ca")
+        assert await cur.fetchall() == [("ca1", 1.0), ("ca2", None)]
+    async with aiosqlite.connect(sr._db_path) as db:
+        cur = await db.execute("SELECT ca, symbol FROM coins ORDER BY ca")
+        assert await cur.fetchall() == [("ca1", "A"), ("ca2", None)]
+    await sr.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_pragmas(tmp_path):
+    sr = StatsRecorder()
+    sr._db_path = os.path.join(str(tmp_path), 'stats.db')
+    await sr.init()
+    async with sr._db.execute("PRAGMA journal_mode") as cur:
+        assert (await cur.fetchone())[0].lower() == 'wal'
+    async with sr._db.execute("PRAGMA synchronous") as cur:
+        assert (await cur.fetchone())[0] == 1
+    await sr.close()
+
+
+@pytest.mark.asyncio
+async def test_jsonl_handle_reused_and_rotated(tmp_path, monkeypatch):
+    import bot.stats as bs
+    monkeypatch.setattr(bs, 'STATS_JSONL_MAX_BYTES', 200)
+    sr = StatsRecorder()
+    path = os.path.join(str(tmp_path), 'signals.jsonl')
+    sr._append_jsonl(path, {"i": 0})
+    fp = sr._jsonl_fps[path]
+    sr._append_jsonl(path, {"i": 1})
+    assert sr._jsonl_fps[path] is fp
+    for i in range(2, 20):
+        sr._append_jsonl(path, {"i": i, "pad": "x" * 20})
+    await sr.close()
+    assert os.path.exists(path + '.1')
+    lines = []
+    for name in os.listdir(str(tmp_path)):
+        with open(os.path.join(str(tmp_path), name), 'rb') as f:
+            lines.extend(f.readlines())
+    assert len(lines) == 20
+
+
+def test_jsonl_rotation_ring(tmp_path, monkeypatch):
+    import bot.stats as bs
+    monkeypatch.setattr(bs, 'STATS_MAX_JSONL_FILES', 3)
+    sr = StatsRecorder()
+    path = os.path.join(str(tmp_path), 'outcomes.jsonl')
+    for i in range(5):
+        with open(path, 'w') as f:
+            f.write(str(i))
+        sr._rotate_jsonl(path)
+    contents = {}
+    for idx in (1, 2, 3):
+        with open(f"{path}.{idx}") as f:
+            contents[idx] = f.read()
+    # slots 1..3 wrap around: generations 3 and 4 overwrote 0 and 1
+    assert contents == {1: '3', 2: '4', 3: '2'}
+    assert not os.path.exists(path + '.4')
+
+
+@pytest.mark.asyncio
+async def test_outcome_horizon_targets(tmp_path):
+    sr = StatsRecorder()
+    sr.dir = str(tmp_path)
+    sr.signals_path = os.path.join(sr.dir, 'signals.jsonl')
+    sr.outcomes_path = os.path.join(sr.dir, 'outcomes.jsonl')
+    sr._db_path = os.path.join(str(tmp_path), 'stats.db')
+    sr.roi_horizons_min = [5, 15]
+    ca = "G2VzymsKt3zNAn4CKBndYcS67w6Kny5sDEp7Y2W1aTf6"
+    s = SignalEvent("2020-01-01T00:00:00+00:00", ca, "TKN", "T1", ["@x"], 1, 1,
+                    1.0, 1.0, 1.0, 1, 1.0, 0.0, 1.0)
+    await sr.record_signal(s)
+    await sr.record_snapshot(ca, {'price_usd': 1.1}, ts_utc="2020-01-01T00:03:00+00:00")
+    await sr.record_snapshot(ca, {'price_usd': 2.0}, ts_utc="2020-01-01T00:16:00+00:00")
+    await sr.maybe_record_outcomes_from_snapshots(ca)
+    await sr.maybe_record_outcomes_from_snapshots(ca)
+    await sr.flush()
+    async with sr._db.execute("SELECT horizon_min, ts_utc FROM outcomes ORDER BY horizon_min") as cur:
+        rows = await cur.fetchall()
+    # The 00:03 snapshot is before both targets; each horizon is recorded once
+    assert rows == [(5, "2020-01-01T00:16:00+00:00"), (15, "2020-01-01T00:16:00+00:00")]
+    assert ca in sr._outcomes_complete
+    with open(sr.outcomes_path, 'rb') as f:
+        assert len(f.readlines()) == 2
+    await sr.close()
+
+
+@pytest.mark.asyncio
+async def test_outcomes_deduplicated_on_open(tmp_path):
+    import sqlite3
+    db = os.path.join(str(tmp_path), 'stats.db')
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE outcomes (id INTEGER PRIMARY KEY AUTOINCREMENT, ts_utc TEXT, ca TEXT, "
+                "horizon_min INTEGER, roi_pct REAL, price_start_usd REAL, price_end_usd REAL)")
+    con.executemany("INSERT INTO outcomes (ts_utc, ca, horizon_min, roi_pct) VALUES (?, ?, ?, ?)",
+                    [("t1", "a", 5, 1.0), ("t2", "a", 5, 2.0), ("t1", "a", 15, 3.0)])
+    con.commit()
+    con.close()
+    sr = StatsRecorder()
+    sr._db_path = db
+    await sr.init()
+    async with sr._db.execute("SELECT horizon_min, roi_pct FROM outcomes ORDER BY horizon_min") as cur:
+        assert await cur.fetchall() == [(5, 1.0), (15, 3.0)]
+    await sr.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_snapshots_moved_on_open(tmp_path):
+    import sqlite3
+    db = os.path.join(str(tmp_path), 'stats.db')
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, ts_utc TEXT, ca TEXT, price_usd REAL)")
+    con.execute("INSERT INTO snapshots (ts_utc, ca, price_usd) VALUES ('2020-01-01T00:00:01.250000+00:00', 'a', 1.0)")
+    con.commit()
+    con.close()
+    sr = StatsRecorder()
+    sr._db_path = db
+    await sr.init()
+    async with sr._db.execute("SELECT ts_ms FROM snap.snapshots") as cur:
+        assert await cur.fetchall() == [(1577836801250,)]
+    async with sr._db.execute("SELECT COUNT(1) FROM main.sqlite_master WHERE name = 'snapshots'") as cur:
+        assert (await cur.fetchone())[0] == 0
+    await sr.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_group_only_drops_its_rows(tmp_path):
+    sr = StatsRecorder()
+    sr._db_path = os.path.join(str(tmp_path), 'stats.db')
+    await sr.init()
+    await sr.record_mention("2020-01-01T00:00:00+00:00", "CA1", "@a", "1")
+    await sr._write("INSERT INTO no_such_table VALUES(?)", (1,))
+    await sr.record_mention("2020-01-01T00:00:01+00:00", "CA2", "@a", "2")
+    await sr.flush()
+    async with sr._db.execute("SELECT ca FROM mentions ORDER BY ca") as cur:
+        assert [r[0] for r in await cur.fetchall()] == ["CA1", "CA2"]
+    await sr.close()
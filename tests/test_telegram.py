@@ -38,3 +38,254 @@ async def test_tiered_alert_cooldown(monkeypatch):
     assert sent["n"] == 1
 
 
+
+
+@pytest.mark.asyncio
+async def test_state_dirty_flag(monkeypatch, tmp_path):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    monkeypatch.setattr(bt, 'STATE_FILE', str(tmp_path / 'state.json'))
+    b = Bot()
+    async def fake_send(*_a, **_k):
+        return None
+    b._send_alert_message = fake_send  # type: ignore
+    assert not b._state_is_dirty()
+    await b._maybe_send_tiered_alert('9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw', 'group', 1)
+    assert b._state_is_dirty()
+    await b._save_state()
+    assert not b._state_is_dirty()
+    assert (tmp_path / 'state.json').exists()
+
+
+def test_coin_counts_cap_keeps_hottest(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    b = Bot()
+    b.coin_counts = {f"ca{i}": i for i in range(bt._COIN_COUNTS_MAX + 1)}
+    b._maybe_reset_counts()
+    assert len(b.coin_counts) == bt._COIN_COUNTS_KEEP
+    assert min(b.coin_counts.values()) == bt._COIN_COUNTS_MAX + 1 - bt._COIN_COUNTS_KEEP
+
+
+@pytest.mark.asyncio
+async def test_t1_cooldown_uses_epoch_seconds(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    monkeypatch.setattr(bt, 'T1_IMMEDIATE', True)
+    monkeypatch.setattr(bt, '_COOLDOWN_T1_SECONDS', 600.0)
+    b = Bot()
+    sent = []
+    async def fake_send(ca, **_k):
+        sent.append(ca)
+    b._send_alert_message = fake_send  # type: ignore
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    await b._maybe_send_tiered_alert(ca, 'group', 1, 1000.0)
+    b.coin_tier_state.clear()
+    await b._maybe_send_tiered_alert(ca, 'group', 1, 1599.0)
+    assert len(sent) == 1
+    b.coin_tier_state.clear()
+    await b._maybe_send_tiered_alert(ca, 'group', 1, 1600.0)
+    assert len(sent) == 2 and b.last_t1_sent_utc[ca] == 1600.0
+
+
+@pytest.mark.asyncio
+async def test_chat_metadata_cached(monkeypatch):
+    import bot.telegram as bt
+    from types import SimpleNamespace
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    b = Bot()
+    calls = {"n": 0}
+
+    async def get_chat():
+        calls["n"] += 1
+        return SimpleNamespace(title="Calls", username="calls")
+
+    ev = SimpleNamespace(chat_id=42, get_chat=get_chat)
+    assert await b._chat_title_and_username(ev) == ("Calls", "calls")
+    assert await b._chat_title_and_username(ev) == ("Calls", "calls")
+    assert calls["n"] == 1
+    monkeypatch.setattr(bt, '_CHAT_META_MAX', 2)
+    for cid in (43, 44):
+        await b._chat_title_and_username(SimpleNamespace(chat_id=cid, get_chat=get_chat))
+    assert list(b._chat_meta) == [43, 44]
+
+
+@pytest.mark.asyncio
+async def test_alerts_queued_and_paced(monkeypatch):
+    import bot.telegram as bt
+    sent = []
+
+    class _SlowClient(_Client):
+        async def send_message(self, _target, text, **_k):
+            sent.append(text)
+
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _SlowClient())
+    monkeypatch.setattr(bt, 'TELEGRAM_SEND_RATE_PER_SEC', 1000.0)
+    b = Bot()
+    b._send_q = asyncio.Queue()
+    await b._send_alert_message('9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw', 'T1 Fresh', '>>> SIGNAL', 'g')
+    await b._send_alert_message('G2VzymsKt3zNAn4CKBndYcS67w6Kny5sDEp7Y2W1aTf6', 'T1 Fresh', '>>> SIGNAL', 'g')
+    # Handlers return before anything is sent
+    assert sent == [] and b._send_q.qsize() == 2
+    sender = asyncio.create_task(b._sender_loop())
+    await asyncio.wait_for(b._send_q.join(), timeout=1)
+    sender.cancel()
+    assert len(sent) == 2 and sent[0].startswith('>>> SIGNAL [T1 Fresh]')
+
+
+@pytest.mark.asyncio
+async def test_dispatch_keeps_chat_order_and_runs_chats_concurrently(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    b = Bot()
+    seen = []
+    release = asyncio.Event()
+
+    async def fake_on_message(ev):
+        if ev.tag == 'a1':
+            # A slow message in chat 1 must not block chat 2, nor be overtaken by a2
+            await release.wait()
+        seen.append(ev.tag)
+
+    b._on_message = fake_on_message
+    for chat_id, tag in ((1, 'a1'), (1, 'a2'), (2, 'b1')):
+        await b._on_event(SimpleNamespace(chat_id=chat_id, tag=tag))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert seen == ['b1']
+    # Chat 2 is idle again, so its lock is gone; chat 1 still has two messages in flight
+    assert list(b._chat_locks) == [1]
+    release.set()
+    await asyncio.gather(*b._bg_tasks)
+    assert seen == ['b1', 'a1', 'a2']
+    assert not b._bg_tasks and not b._chat_locks
+
+
+@pytest.mark.asyncio
+async def test_stop_skips_save_when_clean(monkeypatch, tmp_path):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    monkeypatch.setattr(bt, 'STATE_FILE', str(tmp_path / 'state.json'))
+    b = Bot()
+    b.stats = None
+    await b.stop()
+    assert not (tmp_path / 'state.json').exists()
+
+
+@pytest.mark.asyncio
+async def test_last_t1_state_round_trips(monkeypatch, tmp_path):
+    import json
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    monkeypatch.setattr(bt, 'STATE_FILE', str(tmp_path / 'state.json'))
+    b = Bot()
+    async def fake_send(*_a, **_k):
+        return None
+    b._send_alert_message = fake_send  # type: ignore
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    await b._maybe_send_tiered_alert(ca, 'group', 1, 1700000000.0)
+    await b._save_state()
+    saved = json.loads((tmp_path / 'state.json').read_text())
+    assert saved['last_t1_sent_utc'] == {ca: '2023-11-14T22:13:20+00:00'}
+    b2 = Bot()
+    await b2._load_state()
+    assert b2.last_t1_sent_utc == {ca: 1700000000.0}
+    assert b2._last_t1_iso == saved['last_t1_sent_utc']
+
+
+def test_tier_state_lru_cap(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    monkeypatch.setattr(bt, '_TIER_STATE_MAX', 3)
+    b = Bot()
+    b._touch_tier('a', 1, 1.0)
+    b._touch_tier('b', 1, 2.0)
+    b._touch_tier('c', 1, 3.0)
+    b._touch_tier('a', 2)  # refreshes 'a', so 'b' is now the oldest
+    b._touch_tier('d', 1, 4.0)
+    assert list(b.coin_tier_state) == ['c', 'a', 'd']
+    assert set(b.last_t1_sent_utc) == set(b._last_t1_iso) == {'a', 'c', 'd'}
+    assert b._state_is_dirty()
+
+
+@pytest.mark.asyncio
+async def test_alert_message_format(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    b = Bot()
+    texts = []
+
+    async def fake_enqueue(text, on_sent=None):
+        texts.append(text)
+
+    b._enqueue_send = fake_enqueue  # type: ignore
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    await b._send_alert_message(ca, 'T1 Fresh', '>>> SIGNAL', 'grp')
+    assert texts[0] == (
+        f">>> SIGNAL [T1 Fresh]\nCA: {ca} (9wYu...G7Hw)\nSource: grp\n"
+        f"Links: DexScreener https://dexscreener.com/solana/{ca} | Birdeye https://birdeye.so/token/{ca}?chain=solana"
+        f" | Jupiter https://jup.ag/swap/SOL-{ca}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_evaluator_prune_cadence(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    monkeypatch.setattr(bt, 'ENABLE_EVALUATOR', True)
+    ca = '9wYucdoBb1CV7DcxG1cdKGn6XPHi3QBjyvhb1WejG7Hw'
+    monkeypatch.setattr(bt, 'extract_contract_addresses_from_message', lambda _ev: {ca})
+    b = Bot()
+    b.stats = None
+    b._solana_check_cache[ca] = True
+    pruned = []
+
+    async def process_mention(*_a):
+        return None
+
+    b.evaluator = SimpleNamespace(process_mention=process_mention, prune_memory=lambda: pruned.append(1))
+    b._route = b._resolve_route()
+    assert b._route == b._route_evaluator
+    async def meta(_ev):
+        return 'g', None
+    b._chat_title_and_username = meta  # type: ignore
+    ev = SimpleNamespace(chat_id=1, is_reply=False, fwd_from=None, message=SimpleNamespace(id=1))
+    for _ in range(2 * bt._PRUNE_EVERY_MENTIONS + 1):
+        await b._on_message(ev)
+    assert len(pruned) == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_background_tasks(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    b = Bot()
+    b.stats = None
+    done = b._spawn(asyncio.sleep(0))
+    forever = b._spawn(asyncio.sleep(3600))
+    await done
+    await asyncio.sleep(0)  # let the done callback run
+    assert b._bg_tasks == {forever}
+    await b.stop()
+    assert forever.cancelled() and not b._bg_tasks
+
+
+@pytest.mark.asyncio
+async def test_idless_events_share_no_lock_or_cache_slot(monkeypatch):
+    import bot.telegram as bt
+    monkeypatch.setattr(bt, 'TelegramClient', lambda *_a, **_k: _Client())
+    b = Bot()
+    handled = []
+
+    async def fake_on_message(ev):
+        handled.append(ev)
+
+    b._on_message = fake_on_message
+    await b._dispatch(SimpleNamespace(chat_id=None))
+    assert len(handled) == 1 and not b._chat_locks
+
+    async def get_chat():
+        return SimpleNamespace(title="DM", username=None)
+
+    assert await b._chat_title_and_username(SimpleNamespace(chat_id=None, get_chat=get_chat)) == ("DM", None)
+    assert not b._chat_meta
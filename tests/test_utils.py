@@ -23,3 +23,46 @@ def test_with_retries_eventually_succeeds():
     result = asyncio.get_event_loop().run_until_complete(utils.with_retries(flaky, retries=5, backoff_sec=0))
     assert result == 42
 
+
+
+def test_json_dumps_loads_roundtrip():
+    data = {"jsonrpc": "2.0", "id": 1, "params": ["é", {"encoding": "base64"}]}
+    encoded = utils.json_dumps(data)
+    assert isinstance(encoded, bytes)
+    assert utils.json_loads(encoded) == data
+
+
+def test_ttl_cache_expiry_and_lru(monkeypatch):
+    clock = {"t": 100.0}
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock["t"])
+    cache = utils.TTLCache(maxsize=2, ttl=10)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1  # touch "a" so "b" becomes least recent
+    cache["c"] = 3
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+    clock["t"] += 11
+    assert cache.get("a") is None
+    cache.expire()
+    assert len(cache) == 0
+
+
+def test_scan_resistant_cache_keeps_reused_keys():
+    from bot import utils
+    cache = utils.ScanResistantTTLCache(maxsize=2, ttl=10)
+    cache["hot"] = 1
+    assert cache.get("hot") == 1  # second reference promotes it
+    for i in range(5):
+        cache[f"once{i}"] = i
+    assert cache.get("hot") == 1
+    assert len(cache) == 2 and "once4" in cache and "once0" not in cache
+
+
+def test_write_json_atomic_non_str_keys(tmp_path):
+    path = tmp_path / "state.json"
+    asyncio.get_event_loop().run_until_complete(utils.write_json_atomic(str(path), {1: "é"}))
+    assert asyncio.get_event_loop().run_until_complete(utils.read_json(str(path))) == {"1": "é"}
+
+
+def test_read_json_missing_file(tmp_path):
+    assert asyncio.get_event_loop().run_until_complete(utils.read_json(str(tmp_path / "missing.json"))) is None
@@ -16,3 +16,26 @@ async def test_count_vip_holders(monkeypatch):
     assert "wallet1" in holders or "wallet2" in holders
 
 
+
+
+@pytest.mark.asyncio
+async def test_vip_holdings_one_sweep_per_wallet(monkeypatch):
+    import bot.vip as v
+    calls = []
+
+    def _acc(mint, amount):
+        return {"account": {"data": {"parsed": {"info": {"mint": mint, "tokenAmount": {"uiAmount": amount}}}}}}
+
+    async def fake_rpc(method: str, params: list):
+        calls.append((method, params[0]))
+        if params[1]["programId"] != v._TOKEN_PROGRAM_IDS[0]:
+            return {"value": []}
+        if params[0] == "wallet1":
+            return {"value": [_acc("mintA", 5), _acc("mintB", 0)]}
+        return {"value": [_acc("mintA", 1.5), _acc("mintC", 2)]}
+
+    monkeypatch.setattr(v, "solana_rpc", fake_rpc)
+    held = await v.vip_holdings(["wallet1", "wallet2"])
+    assert held == {"mintA": {"wallet1", "wallet2"}, "mintC": {"wallet2"}}
+    # One call per wallet per token program, independent of how many CAs are tracked
+    assert len(calls) == 2 * len(v._TOKEN_PROGRAM_IDS)